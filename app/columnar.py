@@ -0,0 +1,178 @@
+# app/columnar.py
+
+import json
+
+import numpy as np
+
+from src.config import (
+    NUMERICAL_FEATURES,
+    CATEGORICAL_FEATURES,
+    INPUT_COLUMNS,
+    COLUMNAR_MAX_ROWS,
+    NUMERICAL_INPUT_RULES
+)
+
+# Optional fast body formats (the JSON path has no extra dependencies)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Errors reported per column (the rest are summarized by the count)
+_MAX_REPORTED_ROWS = 5
+
+
+class ColumnarValidationError(ValueError):
+    """
+    Raised when a columnar body is malformed. 'errors' uses FastAPI's 422 'detail' format.
+    """
+
+    def __init__(self, errors: list):
+        super().__init__(f"{len(errors)} validation error(s)")
+        self.errors = errors
+
+
+class UnsupportedMediaTypeError(ValueError):
+    pass
+
+
+_is_string = np.frompyfunc(lambda value: isinstance(value, str), 1, 1)
+
+
+def _error(loc: list, msg: str) -> dict:
+    return {"loc": ["body"] + loc, "msg": msg, "type": "value_error"}
+
+
+def _row_errors(column: str, bad_rows: np.ndarray, msg: str) -> list:
+    rows = np.flatnonzero(bad_rows)
+    errors = [_error([column, int(row)], msg) for row in rows[:_MAX_REPORTED_ROWS]]
+    if len(rows) > _MAX_REPORTED_ROWS:
+        errors.append(_error([column], f"{len(rows) - _MAX_REPORTED_ROWS} more row(s): {msg}"))
+    return errors
+
+
+def _range_errors(column: str, array: np.ndarray, finite: np.ndarray) -> list:
+    # Checks of one numerical column, built from its rule in NUMERICAL_INPUT_RULES (no rule = any finite number)
+    rule = NUMERICAL_INPUT_RULES.get(column, {})
+    errors = []
+    if rule.get("integer"):
+        errors += _row_errors(column, finite & (array != np.floor(array)), "Input should be a whole number")
+    if "min" in rule:
+        if rule["inclusive"]:
+            errors += _row_errors(column, finite & (array < rule["min"]),
+                                  f"Input should be greater than or equal to {rule['min']:g}")
+        else:
+            errors += _row_errors(column, finite & (array <= rule["min"]), f"Input should be greater than {rule['min']:g}")
+    return errors
+
+
+def _as_array(columns: dict, column: str, dtype=None) -> np.ndarray:
+    # Ragged or nested values ([1, [2]], [[1], [2, 3]]) cannot become an array: a validation error, not a 500
+    try:
+        return np.asarray(columns[column], dtype=dtype)
+    except (ValueError, TypeError):
+        raise ColumnarValidationError([_error([column], "Input should be a flat array of scalar values.")])
+
+
+def decode_body(body: bytes, content_type: str) -> dict:
+    """
+    Decodes a columnar request body into {column name: list or array}.
+
+    - application/json:                      {"Frequency": [...], "Monetary": [...], "Country": [...]}
+    - application/msgpack:                   the same map, MessagePack-encoded (needs 'msgpack')
+    - application/vnd.apache.arrow.stream:   an Arrow IPC stream with those columns (needs 'pyarrow')
+    """
+    media_type = (content_type or JSON_CONTENT_TYPE).split(";")[0].strip().lower()
+
+    try:
+        if media_type == JSON_CONTENT_TYPE:
+            columns = json.loads(body)
+        elif media_type in MSGPACK_CONTENT_TYPES:
+            if msgpack is None:
+                raise UnsupportedMediaTypeError("MessagePack bodies need the 'msgpack' package.")
+            columns = msgpack.unpackb(body)
+        elif media_type == ARROW_CONTENT_TYPE:
+            if pa is None:
+                raise UnsupportedMediaTypeError("Arrow bodies need the 'pyarrow' package.")
+            table = pa.ipc.open_stream(body).read_all()
+            columns = {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+        else:
+            raise UnsupportedMediaTypeError(f"Unsupported content type '{media_type}'.")
+    except UnsupportedMediaTypeError:
+        raise
+    except Exception as e:
+        raise ColumnarValidationError([_error([], f"Could not decode the {media_type} body: {e}")])
+
+    if not isinstance(columns, dict):
+        raise ColumnarValidationError([_error([], "The body must be an object of columns (column name -> array).")])
+    return columns
+
+
+def validate_columns(columns: dict) -> dict:
+    """
+    Validates whole columns at once with array operations (no per-record pydantic model).
+
+    - every input column is present and all have the same, non-zero length (<= COLUMNAR_MAX_ROWS)
+    - numerical columns: finite numbers within their NUMERICAL_INPUT_RULES range
+      (Frequency: whole numbers >= 1, Monetary: > 0; the same rules as the 'ChurnInput' model of '/predict')
+    - Country: non-blank strings
+
+    return: {"Frequency": float64 array, "Monetary": float64 array, "Country": str array}
+    """
+    missing = [column for column in INPUT_COLUMNS if column not in columns]
+    if missing:
+        raise ColumnarValidationError([_error([column], "Field required") for column in missing])
+
+    # Categorical columns stay object arrays: np.asarray would silently turn numbers into strings
+    arrays = {column: _as_array(columns, column) for column in NUMERICAL_FEATURES}
+    arrays.update({column: _as_array(columns, column, dtype=object) for column in CATEGORICAL_FEATURES})
+    lengths = {column: array.shape[0] if array.ndim == 1 else -1 for column, array in arrays.items()}
+    if len(set(lengths.values())) != 1 or -1 in lengths.values():
+        raise ColumnarValidationError([_error([], f"All columns must be flat arrays of the same length, got {lengths}.")])
+    n_rows = lengths[INPUT_COLUMNS[0]]
+    if not 0 < n_rows <= COLUMNAR_MAX_ROWS:
+        raise ColumnarValidationError([_error([], f"Expected 1 to {COLUMNAR_MAX_ROWS} rows, got {n_rows}.")])
+
+    errors = []
+    validated = {}
+
+    for column in NUMERICAL_FEATURES:
+        array = arrays[column]
+        if array.dtype.kind not in "iuf":
+            errors.append(_error([column], f"Input should be an array of numbers, got {array.dtype}."))
+            continue
+        array = array.astype(np.float64)
+        finite = np.isfinite(array)
+        errors += _row_errors(column, ~finite, "Input should be a finite number")
+        errors += _range_errors(column, array, finite)
+        validated[column] = array
+
+    for column in CATEGORICAL_FEATURES:
+        array = arrays[column]
+        is_string = _is_string(array).astype(bool)
+        if not is_string.all():
+            errors += _row_errors(column, ~is_string, "Input should be a valid string")
+            continue
+        array = array.astype(str)
+        errors += _row_errors(column, np.char.str_len(np.char.strip(array)) == 0, "Input should be a non-empty string")
+        validated[column] = array
+
+    if errors:
+        raise ColumnarValidationError(errors)
+    return validated
+
+
+def parse_columnar(body: bytes, content_type: str) -> dict:
+    """
+    decode_body + validate_columns: raw request body -> validated column arrays.
+    """
+    return validate_columns(decode_body(body, content_type))
@@ -1,12 +1,18 @@
 # app/main.py
 
 import joblib
-import pandas as pd
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from app.schema import ChurnInput, PredictionResponse
+from app.columnar import parse_columnar, ColumnarValidationError, UnsupportedMediaTypeError
+import os
 import sys
+from pathlib import Path
 
-from src.config import MODEL_OUTPUT_PATH
+from src.config import MODEL_OUTPUT_PATH, DECISION_THRESHOLD
+from src.export import FoldedPreprocessor
+from src.monitoring import DriftMonitor
 
 # --- Installing the Application and Model ---
 app = FastAPI(
@@ -18,13 +24,23 @@ app = FastAPI(
 def load_model():
     """
     When starting the API, v2.1 (XGBoost @ 0.7710) loads from the special 'models/' sections and assigns them to 'app.state.model'.
+    The 'CHURN_MODEL_PATH' environment variable overrides the default path (used by the load-test harness).
     """
     print("API is starting and loading v2.1 Churn model...")
+    model_path = Path(os.getenv("CHURN_MODEL_PATH", MODEL_OUTPUT_PATH))
     try:
-        app.state.model = joblib.load(MODEL_OUTPUT_PATH)
-        print(f"Model successfully loaded from {MODEL_OUTPUT_PATH}.")
+        app.state.model = joblib.load(model_path)
+        # Threshold tuned during training (stored on the pipeline); older models fall back to the default
+        app.state.threshold = getattr(app.state.model, "decision_threshold_", DECISION_THRESHOLD)
+        # Preprocessing folded into NumPy (incl. the Country -> one-hot index), feeding the classifier directly
+        app.state.preprocessor = FoldedPreprocessor.from_pipeline(app.state.model)
+        app.state.classifier = app.state.model.named_steps["classifier"]
+        # Streaming input/prediction summaries vs the training reference profile (older models have none)
+        reference_profile = getattr(app.state.model, "reference_profile_", None)
+        app.state.drift_monitor = DriftMonitor(reference_profile) if reference_profile else None
+        print(f"Model successfully loaded from {model_path} (decision threshold: {app.state.threshold:.2f}).")
     except FileNotFoundError:
-        print(f"ERROR: Model not found at {MODEL_OUTPUT_PATH}.")
+        print(f"ERROR: Model not found at {model_path}.")
         print("Please make sure to run 'python -m src.train' before running the API.")
         app.state.model = None
     except Exception as e:
@@ -43,22 +59,101 @@ def read_root():
     return {"status": "ok", "message": "Churn Prediction API is running!"}
 
 
+@app.get("/metrics", tags=["Monitoring"])
+def read_metrics():
+    """
+    Serving metrics: per categorical feature, the vocabulary size and how many looked-up values were unknown.
+    """
+    if app.state.model is None:
+        return {"status": "error", "message": "Model could not be loaded!"}
+    return {"categories": app.state.preprocessor.category_stats()}
+
+
+@app.get("/monitoring/drift", tags=["Monitoring"])
+def read_drift(refresh: bool = False):
+    """
+    Input and prediction drift of the live traffic against the training data: PSI per feature
+    (+ KS for Frequency/Monetary) and the live vs reference churn rate.
+    The report is recomputed at most every DRIFT_REPORT_INTERVAL seconds unless '?refresh=true'.
+    """
+    if app.state.model is None:
+        return {"status": "error", "message": "Model could not be loaded!"}
+    if app.state.drift_monitor is None:
+        return {"status": "error", "message": "The model has no reference profile (retrain to enable drift monitoring)."}
+    return app.state.drift_monitor.report(refresh=refresh)
+
+
 @app.post("/predict",
           response_model=PredictionResponse,
+          response_model_exclude_none=True,
           tags=["Prediction"])
-def predict_churn(churn_input: ChurnInput):
+def predict_churn(churn_input: ChurnInput, include_probability: bool = False):
     """
     It takes the 'engineered' attributes (F, M, Country) and predicts the 'CHURN' status (1 or 0).
     Thanks to Pydantic (ChurnInput schema), the incoming data is guaranteed to be in the correct format.
+
+    The decision is P(CHURN) >= the threshold stored with the model. With '?include_probability=true'
+    the probability and the threshold are returned as well (same single inference call).
     """
     if app.state.model is None:
         return {"error": "Model is not loaded."}
 
-    # 1. Convert Pydantic model (ChurnInput) to a DataFrame
-    input_data = pd.DataFrame([churn_input.model_dump()])
+    # 1. Convert Pydantic model (ChurnInput) to the model's numeric input
+    #    (one-hot position of 'Country' straight from the CategoryIndex built at startup)
+    input_data = {feature: [value] for feature, value in churn_input.model_dump().items()}
+    matrix = app.state.preprocessor.transform(input_data)
 
-    # 2. Predict
-    prediction = app.state.model.predict(input_data)[0]
+    # 2. Predict (one 'predict_proba' call; the threshold is applied here, not by 'predict')
+    churn_proba = float(app.state.classifier.predict_proba(matrix)[0, 1])
+    prediction = int(churn_proba >= app.state.threshold)
+    if app.state.drift_monitor is not None:
+        app.state.drift_monitor.update(input_data, [prediction])
 
     # 3. The result is based on the Pydantic response model (PredictionResponse)
-    return {"CHURN": prediction}
\ No newline at end of file
+    if include_probability:
+        return {"CHURN": prediction, "CHURN_PROBABILITY": churn_proba, "THRESHOLD": app.state.threshold}
+    return {"CHURN": prediction}
+
+
+def score_columns(columns: dict, include_probability: bool) -> dict:
+    """
+    Validated column arrays -> model input matrix -> one 'predict_proba' call for the whole batch.
+    """
+    matrix = app.state.preprocessor.transform(columns)
+    churn_proba = app.state.classifier.predict_proba(matrix)[:, 1]
+    predictions = (churn_proba >= app.state.threshold).astype(int)
+    if app.state.drift_monitor is not None:
+        app.state.drift_monitor.update(columns, predictions)
+
+    result = {"CHURN": predictions.tolist()}
+    if include_probability:
+        result["CHURN_PROBABILITY"] = churn_proba.tolist()
+        result["THRESHOLD"] = app.state.threshold
+    return result
+
+
+@app.post("/predict/columnar",
+          tags=["Prediction"])
+async def predict_churn_columnar(request: Request, include_probability: bool = False):
+    """
+    High-volume batch scoring. The body holds one array per feature instead of one object per customer:
+    {"Frequency": [...], "Monetary": [...], "Country": [...]} as JSON, MessagePack ('application/msgpack')
+    or an Arrow IPC stream ('application/vnd.apache.arrow.stream').
+
+    Types and ranges are validated per column with array operations (no per-record pydantic model),
+    and the columns go straight to the model's numeric input. Invalid data returns 422 like '/predict'.
+    """
+    if app.state.model is None:
+        return JSONResponse({"error": "Model is not loaded."}, status_code=503)
+
+    body = await request.body()
+    try:
+        columns = parse_columnar(body, request.headers.get("content-type"))
+    except UnsupportedMediaTypeError as e:
+        return JSONResponse({"detail": str(e)}, status_code=415)
+    except ColumnarValidationError as e:
+        return JSONResponse({"detail": e.errors}, status_code=422)
+
+    # Scoring is CPU-bound: keep it off the event loop
+    result = await run_in_threadpool(score_columns, columns, include_probability)
+    return JSONResponse(result)
\ No newline at end of file
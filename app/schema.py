@@ -1,7 +1,15 @@
 # app/schema.py
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Optional
+
+from src.config import NUMERICAL_INPUT_RULES
+
+
+def _range(feature: str) -> dict:
+    # 'ge'/'gt' bound of a numerical feature from NUMERICAL_INPUT_RULES in config.py
+    rule = NUMERICAL_INPUT_RULES[feature]
+    return {"ge" if rule["inclusive"] else "gt": rule["min"]}
 
 
 # === Architecture ===
@@ -9,15 +17,22 @@ from typing import Optional
 # The data model that our API will receive FROM THE EXTERNAL (INPUT)
 class ChurnInput(BaseModel):
     # From NUMERICAL_FEATURES in config.py
-    Frequency: int = Field(..., description="Total number of unique invoices (F)")
-    Monetary: float = Field(..., description="Total monetary value of purchases (M)")
+    # Same rules as '/predict/columnar' (NUMERICAL_INPUT_RULES in config.py)
+    Frequency: int = Field(..., **_range("Frequency"), description="Total number of unique invoices (F)")
+    Monetary: float = Field(..., **_range("Monetary"), allow_inf_nan=False,
+                            description="Total monetary value of purchases (M)")
 
-    # From CATEGORICAL_FEATURES in config.py
-    Country: str = Field(..., description="Customer's primary country")
+    # From CATEGORICAL_FEATURES in config.py (blank values are rejected, like in '/predict/columnar')
+    Country: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)] = Field(
+        ..., description="Customer's primary country")
 
 
 
 # The response model that our API will give OUTPUT
 class PredictionResponse(BaseModel):
     # From TARGET_VARIABLE in config.py
-    CHURN: int = Field(..., description="Predicted churn status (1 for Churn, 0 for No Churn)")
\ No newline at end of file
+    CHURN: int = Field(..., description="Predicted churn status (1 for Churn, 0 for No Churn)")
+
+    # Only returned when the request asks for probabilities (include_probability=true)
+    CHURN_PROBABILITY: Optional[float] = Field(None, description="Predicted probability of churn P(CHURN=1)")
+    THRESHOLD: Optional[float] = Field(None, description="Decision threshold applied to CHURN_PROBABILITY")
\ No newline at end of file
@@ -0,0 +1,99 @@
+# benchmarks/columnar_parsing.py
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter
+
+from app.schema import ChurnInput
+from app.columnar import parse_columnar, JSON_CONTENT_TYPE, ARROW_CONTENT_TYPE, pa
+from src.config import DECISION_THRESHOLD, INPUT_COLUMNS
+from src.export import FoldedPreprocessor
+from benchmarks.synthetic import fit_synthetic_pipeline, make_payloads
+
+
+def _rows_per_second(function, n_rows: int, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return n_rows / float(np.median(timings))
+
+
+def _arrow_body(payloads: list) -> bytes:
+    table = pa.Table.from_pylist(payloads)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def benchmark(n_rows: int = 10_000, n_per_record: int = 500, repeats: int = 5) -> dict:
+    """
+    Parse + score throughput (rows/s) of the request paths, from raw JSON bytes to churn decisions.
+
+    - per_record_pydantic: what '/predict' does per customer (validate, model_dump, DataFrame, predict_proba)
+    - pydantic_list:       one pydantic validation of the whole list, one DataFrame, one predict_proba
+    - columnar_json:       '/predict/columnar' (array validation -> folded preprocessing -> classifier)
+    - columnar_arrow:      the same with an Arrow IPC body (if pyarrow is installed)
+    """
+    pipeline = fit_synthetic_pipeline()
+    preprocessor = FoldedPreprocessor.from_pipeline(pipeline)
+    classifier = pipeline.named_steps["classifier"]
+
+    payloads = make_payloads(n_rows)
+    record_bodies = [json.dumps(payload).encode() for payload in payloads[:n_per_record]]
+    list_body = json.dumps(payloads).encode()
+    columnar_body = json.dumps({column: [payload[column] for payload in payloads]
+                                for column in INPUT_COLUMNS}).encode()
+    list_adapter = TypeAdapter(list[ChurnInput])
+
+    def per_record_pydantic():
+        for body in record_bodies:
+            churn_input = ChurnInput.model_validate_json(body)
+            input_data = pd.DataFrame([churn_input.model_dump()])
+            int(pipeline.predict_proba(input_data)[0, 1] >= DECISION_THRESHOLD)
+
+    def pydantic_list():
+        inputs = list_adapter.validate_json(list_body)
+        input_data = pd.DataFrame([churn_input.model_dump() for churn_input in inputs])
+        (pipeline.predict_proba(input_data)[:, 1] >= DECISION_THRESHOLD).astype(int)
+
+    def columnar(body: bytes, content_type: str):
+        columns = parse_columnar(body, content_type)
+        (classifier.predict_proba(preprocessor.transform(columns))[:, 1] >= DECISION_THRESHOLD).astype(int)
+
+    results = {
+        "per_record_pydantic": _rows_per_second(per_record_pydantic, n_per_record, max(repeats // 2, 1)),
+        "pydantic_list": _rows_per_second(pydantic_list, n_rows, repeats),
+        "columnar_json": _rows_per_second(lambda: columnar(columnar_body, JSON_CONTENT_TYPE), n_rows, repeats),
+    }
+    if pa is not None:
+        arrow_body = _arrow_body(payloads)
+        results["columnar_arrow"] = _rows_per_second(lambda: columnar(arrow_body, ARROW_CONTENT_TYPE), n_rows, repeats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-record pydantic vs columnar parse + score throughput.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--per-record-rows", type=int, default=500,
+                        help="Rows for the (slow) per-record path.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = benchmark(args.rows, args.per_record_rows, args.repeats)
+
+    baseline = results["per_record_pydantic"]
+    print(f"\n===== Parse + Score Throughput ({args.rows} rows) =====")
+    print(f"{'path':<22}{'rows/s':>14}{'vs per-record':>16}")
+    for path, rows_per_s in results.items():
+        print(f"{path:<22}{rows_per_s:>14,.0f}{rows_per_s / baseline:>15.1f}x")
+
+
+if __name__ == "__main__":
+    main()
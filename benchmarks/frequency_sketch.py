@@ -0,0 +1,110 @@
+# benchmarks/frequency_sketch.py
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.config import COL_CUSTOMER_ID, COL_INVOICE, HLL_PRECISION
+from src.sketches import sketch_invoices
+from benchmarks.synthetic import make_transactions
+
+
+def _measure(function) -> tuple:
+    """
+    return: (result, wall time in s, peak traced memory in MB)
+
+    Time and memory come from separate runs: tracemalloc slows down every Python allocation.
+    """
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def benchmark(df: pd.DataFrame, precision: int = HLL_PRECISION, chunk_size: int = 100_000,
+              n_jobs: int = 1) -> dict:
+    """
+    Exact 'nunique()' Frequency vs the HyperLogLog sketches: time, peak memory, state size and error.
+
+    The chunked run builds one sketch per 'chunk_size' rows and merges them, like a partitioned
+    or day-by-day job would; its registers must be identical to the single-pass sketch.
+    """
+    exact, exact_s, exact_peak_mb = _measure(lambda: df.groupby(COL_CUSTOMER_ID)[COL_INVOICE].nunique())
+    sketch, sketch_s, sketch_peak_mb = _measure(
+        lambda: sketch_invoices(df, COL_CUSTOMER_ID, COL_INVOICE, precision))
+    chunked, chunked_s, chunked_peak_mb = _measure(
+        lambda: sketch_invoices(df, COL_CUSTOMER_ID, COL_INVOICE, precision, chunk_size, n_jobs))
+
+    estimate = sketch.estimate().reindex(exact.index)
+    frequency = estimate.round().clip(lower=1)
+    relative_error = np.abs(estimate - exact) / exact
+    large = exact >= 100
+
+    # What an exact, mergeable state would have to keep: every distinct (customer, invoice) pair
+    n_pairs = int(df[[COL_CUSTOMER_ID, COL_INVOICE]].astype(str).drop_duplicates().shape[0])
+
+    return {
+        "rows": len(df),
+        "customers": len(exact),
+        "distinct_pairs": n_pairs,
+        "exact_s": exact_s,
+        "exact_peak_mb": exact_peak_mb,
+        "sketch_s": sketch_s,
+        "sketch_peak_mb": sketch_peak_mb,
+        "chunked_s": chunked_s,
+        "chunked_peak_mb": chunked_peak_mb,
+        "chunked_matches_single_pass": bool(np.array_equal(chunked.registers, sketch.registers)),
+        "sketch_state_mb": sketch.nbytes / 1e6,
+        "mean_relative_error": float(relative_error.mean()),
+        "p95_relative_error": float(relative_error.quantile(0.95)),
+        "max_relative_error": float(relative_error.max()),
+        "large_customers": int(large.sum()),
+        "large_mean_relative_error": float(relative_error[large].mean()) if large.any() else float("nan"),
+        "exact_match_rate": float((frequency == exact).mean()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact vs HyperLogLog distinct-invoice counting (Frequency).")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use generated transactions instead of the raw Excel file.")
+    parser.add_argument("--customers", type=int, default=5000, help="Customers for --synthetic.")
+    parser.add_argument("--precision", type=int, default=HLL_PRECISION)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--n-jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        df = make_transactions(args.customers)
+    else:
+        from src.data_processing import load_and_clean_data
+        df = load_and_clean_data()
+
+    report = benchmark(df, args.precision, args.chunk_size, args.n_jobs)
+
+    print(f"\n===== Frequency: exact vs HyperLogLog (p={args.precision}, "
+          f"{report['rows']:,} rows, {report['customers']:,} customers) =====")
+    print(f"{'method':<22}{'time (s)':>10}{'peak memory (MB)':>18}")
+    print(f"{'exact nunique()':<22}{report['exact_s']:>10.3f}{report['exact_peak_mb']:>18.1f}")
+    print(f"{'hll single pass':<22}{report['sketch_s']:>10.3f}{report['sketch_peak_mb']:>18.1f}")
+    print(f"{'hll chunked + merge':<22}{report['chunked_s']:>10.3f}{report['chunked_peak_mb']:>18.1f}")
+    print(f"Mergeable state: {report['sketch_state_mb']:.2f} MB of registers vs "
+          f"{report['distinct_pairs']:,} distinct (customer, invoice) pairs for an exact state.")
+    print(f"Chunked sketch == single-pass sketch: {report['chunked_matches_single_pass']}")
+    print(f"Relative error: mean {report['mean_relative_error']:.2%}, p95 {report['p95_relative_error']:.2%}, "
+          f"max {report['max_relative_error']:.2%}")
+    print(f"Customers with >= 100 invoices ({report['large_customers']}): "
+          f"mean relative error {report['large_mean_relative_error']:.2%}")
+    print(f"Rounded estimate equals the exact count for {report['exact_match_rate']:.1%} of customers.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# benchmarks/load_test.py
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from src.config import PROJECT_ROOT, MODEL_OUTPUT_PATH, INPUT_COLUMNS
+from benchmarks.synthetic import make_payloads, save_synthetic_model
+
+COLUMNAR_BATCH_SIZE = 100  # customers per '/predict/columnar' request
+
+
+def _columnar_batch(payloads: list, i: int) -> dict:
+    start = (i * COLUMNAR_BATCH_SIZE) % len(payloads)
+    batch = (payloads + payloads)[start:start + COLUMNAR_BATCH_SIZE]
+    return {column: [payload[column] for payload in batch] for column in INPUT_COLUMNS}
+
+
+# === Scenarios ===
+# Each scenario maps an endpoint to a function building the i-th request body
+# from the list of synthetic ChurnInput payloads ('rows' = customers per request).
+SCENARIOS = {
+    "predict": {
+        "path": "/predict",
+        "body": lambda payloads, i: payloads[i % len(payloads)],
+        "rows": 1
+    },
+    "columnar": {
+        "path": "/predict/columnar",
+        "body": _columnar_batch,
+        "rows": COLUMNAR_BATCH_SIZE
+    },
+}
+
+SERVER_BOOT_TIMEOUT = 30  # seconds
+
+
+def summarize(latencies: list, n_errors: int, wall_time: float) -> dict:
+    """
+    Turns raw per-request latencies (seconds) into the load-test report.
+
+    return: dict with requests, RPS, p50/p95/p99 latency (ms) and error rate
+    """
+    n_requests = len(latencies)
+    latencies_ms = np.asarray(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if n_requests else (0.0, 0.0, 0.0)
+    return {
+        "requests": n_requests,
+        "errors": n_errors,
+        "error_rate": n_errors / n_requests if n_requests else 0.0,
+        "wall_time_s": wall_time,
+        "rps": n_requests / wall_time if wall_time > 0 else 0.0,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+async def drive_endpoint(client: httpx.AsyncClient, scenario: dict, payloads: list,
+                         n_requests: int, concurrency: int) -> dict:
+    """
+    Sends 'n_requests' POST requests to one endpoint from 'concurrency' workers.
+
+    Every non-200 response (or transport error) counts as an error.
+    """
+    latencies = []
+    n_errors = 0
+    request_ids = iter(range(n_requests))  # shared by all workers
+
+    async def worker():
+        nonlocal n_errors
+        for i in request_ids:
+            body = scenario["body"](payloads, i)
+            start = time.perf_counter()
+            try:
+                response = await client.post(scenario["path"], json=body)
+                failed = response.status_code != 200
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            n_errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - start
+
+    stats = summarize(latencies, n_errors, wall_time)
+    stats["rows_per_s"] = stats["rps"] * scenario["rows"]
+    return stats
+
+
+@asynccontextmanager
+async def asgi_client(model_path: Path, concurrency: int):
+    """
+    In-process mode: calls 'app.main:app' through httpx's ASGI transport (no socket, no network).
+    """
+    from app.main import app, load_model
+
+    # The ASGI transport does not send lifespan events, so run the startup hook by hand
+    previous_path = os.environ.get("CHURN_MODEL_PATH")
+    os.environ["CHURN_MODEL_PATH"] = str(model_path)
+    try:
+        load_model()
+    finally:
+        if previous_path is None:
+            os.environ.pop("CHURN_MODEL_PATH")
+        else:
+            os.environ["CHURN_MODEL_PATH"] = previous_path
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        yield client
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_client(model_path: Path, concurrency: int, port: int = None):
+    """
+    Socket mode: starts 'uvicorn app.main:app' on 127.0.0.1 as a subprocess and talks to it over HTTP.
+    """
+    port = port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "CHURN_MODEL_PATH": str(model_path)}
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=env
+    )
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, trust_env=False) as client:
+            # Wait for the Uvicorn server to boot and the model to load
+            deadline = time.monotonic() + SERVER_BOOT_TIMEOUT
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"Uvicorn exited with code {server.returncode} during startup.")
+                try:
+                    response = await client.get("/")
+                    if response.json().get("status") == "ok":
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"API did not become healthy within {SERVER_BOOT_TIMEOUT} seconds.")
+                await asyncio.sleep(0.2)
+
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def run_load_test(model_path: Path, mode: str = "asgi", endpoints: list = None,
+                        n_requests: int = 1000, concurrency: int = 16, warmup: int = 20,
+                        seed: int = 42, port: int = None) -> dict:
+    """
+    Runs the load test against every requested endpoint and returns one report per endpoint.
+
+    Payloads are generated from a fixed seed, so two runs send exactly the same requests.
+    """
+    endpoints = endpoints or list(SCENARIOS)
+    payloads = make_payloads(max(n_requests, 1), seed=seed)
+
+    if mode == "asgi":
+        client_context = asgi_client(model_path, concurrency)
+    elif mode == "uvicorn":
+        client_context = uvicorn_client(model_path, concurrency, port=port)
+    else:
+        raise ValueError(f"Unknown mode '{mode}'. Use 'asgi' or 'uvicorn'.")
+
+    report = {}
+    async with client_context as client:
+        for name in endpoints:
+            scenario = SCENARIOS[name]
+            # Warm-up requests are not measured (first-call overhead, connection setup)
+            await drive_endpoint(client, scenario, payloads, warmup, min(concurrency, max(warmup, 1)))
+            report[name] = await drive_endpoint(client, scenario, payloads, n_requests, concurrency)
+    return report
+
+
+def print_report(report: dict, mode: str, concurrency: int):
+    print(f"\n===== Load Test Report (mode={mode}, concurrency={concurrency}) =====")
+    print(f"{'endpoint':<12}{'requests':>10}{'RPS':>10}{'rows/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>10}")
+    for name, stats in report.items():
+        print(f"{name:<12}{stats['requests']:>10}{stats['rps']:>10.1f}{stats['rows_per_s']:>12.0f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['error_rate']:>10.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the Churn Prediction API.")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi",
+                        help="'asgi': in-process ASGI transport, 'uvicorn': local server over a socket.")
+    parser.add_argument("--endpoints", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=None, help="Port for 'uvicorn' mode (default: a free port).")
+    parser.add_argument("--model-path", type=Path, default=Path(os.getenv("CHURN_MODEL_PATH", MODEL_OUTPUT_PATH)))
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Serve a model fitted on synthetic customers (no raw data needed, CI-friendly).")
+    parser.add_argument("--output", type=Path, default=None, help="Optional path for a JSON report.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = args.model_path
+        if args.synthetic:
+            model_path = save_synthetic_model(Path(tmp_dir) / "churn_model.joblib", seed=args.seed)
+        elif not model_path.exists():
+            print(f"ERROR: Model not found at {model_path}.")
+            print("Run 'python -m src.train' first, or pass '--synthetic'.")
+            sys.exit(1)
+
+        report = asyncio.run(run_load_test(
+            model_path,
+            mode=args.mode,
+            endpoints=args.endpoints,
+            n_requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            seed=args.seed,
+            port=args.port
+        ))
+
+    print_report(report, args.mode, args.concurrency)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nJSON report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
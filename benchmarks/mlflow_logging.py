@@ -0,0 +1,113 @@
+# benchmarks/mlflow_logging.py
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import mlflow
+from joblib import dump
+
+from src.config import INPUT_COLUMNS
+from src.tracking import AsyncMlflowLogger
+from src.mlflow_model import save_pyfunc_model
+from src.export import export_inference_artifact
+from benchmarks.synthetic import fit_synthetic_pipeline, make_customer_features
+
+
+def log_training_like_run(logger, n_params: int, n_metrics: int, n_steps: int, artifacts: dict):
+    """
+    Logs what 'run_training()' logs: params, scalar metrics, per-step curves, the threshold sweep and
+    reference profile texts, the 'model_churn' pyfunc model directory (built from the dumped joblib file)
+    and the native export directory.
+    'logger' is either the 'mlflow' module (synchronous) or an 'AsyncMlflowLogger'.
+    """
+    logger.log_params({f"param_{i}": i for i in range(n_params)})
+    for i in range(n_metrics):
+        logger.log_metric(f"metric_{i}", i * 0.01)
+    for step in range(n_steps):
+        logger.log_metric("val_logloss", 1.0 / (step + 1), step=step)
+    logger.log_text(artifacts["sweep_csv"], "threshold_sweep.csv")
+    logger.log_text(artifacts["reference_profile_json"], "reference_profile.json")
+
+    def build_model_dir():
+        return save_pyfunc_model(artifacts["pipeline"], artifacts["model_path"], artifacts["model_dir"],
+                                 artifacts["input_example"])
+
+    if isinstance(logger, AsyncMlflowLogger):
+        logger.log_built_artifacts(build_model_dir, artifact_path="model_churn")
+    else:
+        logger.log_artifacts(str(build_model_dir()), artifact_path="model_churn")
+    logger.log_artifacts(str(artifacts["export_dir"]), artifact_path="model_native")
+
+
+def benchmark(tracking_uri: str, n_params: int = 20, n_metrics: int = 30, n_steps: int = 150) -> dict:
+    """
+    Times the synchronous 'mlflow.log_*' calls (incl. building the pyfunc model) against the AsyncMlflowLogger.
+
+    'critical_path_s' is the time training is blocked; 'total_s' includes the final flush.
+    """
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment("Logging Benchmark")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pipeline = fit_synthetic_pipeline(500)
+        artifacts = {
+            "pipeline": pipeline,
+            "model_path": Path(tmp_dir) / "churn_model.joblib",
+            "model_dir": Path(tmp_dir) / "mlflow_model",
+            "export_dir": export_inference_artifact(pipeline, Path(tmp_dir) / "native"),
+            "input_example": make_customer_features(5)[INPUT_COLUMNS],
+            "sweep_csv": "threshold,precision,recall,f1\n" + "0.5,0.5,0.5,0.5\n" * 91,
+            "reference_profile_json": json.dumps(pipeline.reference_profile_, indent=2),
+        }
+        dump(pipeline, artifacts["model_path"])
+
+        results = {}
+        with mlflow.start_run(run_name="sync"):
+            start = time.perf_counter()
+            log_training_like_run(mlflow, n_params, n_metrics, n_steps, artifacts)
+            elapsed = time.perf_counter() - start
+            results["sync"] = {"critical_path_s": elapsed, "total_s": elapsed}
+
+        with mlflow.start_run(run_name="async") as run:
+            start = time.perf_counter()
+            tracker = AsyncMlflowLogger(run.info.run_id)
+            log_training_like_run(tracker, n_params, n_metrics, n_steps, artifacts)
+            critical_path = time.perf_counter() - start
+            tracker.close()
+            results["async"] = {"critical_path_s": critical_path, "total_s": time.perf_counter() - start}
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synchronous vs background/batched MLflow logging.")
+    parser.add_argument("--tracking-uri", default=None,
+                        help="Tracking backend (default: a temporary local file store).")
+    parser.add_argument("--params", type=int, default=20)
+    parser.add_argument("--metrics", type=int, default=30)
+    parser.add_argument("--steps", type=int, default=150, help="Points of the per-iteration curve.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tracking_uri = args.tracking_uri
+        if tracking_uri is None:
+            # Local file store as a stand-in for a remote tracking server
+            os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+            tracking_uri = Path(tmp_dir, "mlruns").as_uri()
+
+        results = benchmark(tracking_uri, args.params, args.metrics, args.steps)
+
+    print(f"\n===== MLflow Logging Benchmark ({tracking_uri}) =====")
+    print(f"{'mode':<8}{'critical path (s)':>20}{'total incl. flush (s)':>24}")
+    for mode, timings in results.items():
+        print(f"{mode:<8}{timings['critical_path_s']:>20.4f}{timings['total_s']:>24.4f}")
+    print(f"Training is blocked x{results['sync']['critical_path_s'] / results['async']['critical_path_s']:.0f} "
+          f"less with the background logger.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+from joblib import dump
+from pathlib import Path
+
+from src.config import (
+    RANDOM_STATE,
+    TARGET_VARIABLE,
+    CHURN_THRESHOLD_DAYS,
+    DECISION_THRESHOLD,
+    COL_CUSTOMER_ID,
+    COL_INVOICE,
+    COL_INVOICE_DATE,
+    COL_COUNTRY
+)
+from src.pipeline import create_pipeline
+from src.monitoring import build_reference_profile
+
+# Roughly the country mix of the Online Retail II customers (UK dominates).
+SYNTHETIC_COUNTRIES = [
+    "United Kingdom", "Germany", "France", "EIRE", "Spain",
+    "Netherlands", "Belgium", "Switzerland", "Portugal", "Australia"
+]
+SYNTHETIC_COUNTRY_WEIGHTS = [0.82, 0.03, 0.03, 0.02, 0.02, 0.02, 0.02, 0.02, 0.01, 0.01]
+
+
+def make_customer_features(n_customers: int = 2000, seed: int = RANDOM_STATE) -> pd.DataFrame:
+    """
+    Generates a customer feature table with the same columns as 'create_customer_features()'.
+
+    The benchmarks and tests use it so they can run without the raw Excel file.
+    Low-frequency, low-spend customers are made more likely to churn, so a fitted
+    model produces both classes.
+
+    return: DataFrame with Recency, Frequency, Monetary, Country and CHURN columns.
+    """
+    rng = np.random.default_rng(seed)
+
+    frequency = rng.geometric(p=0.25, size=n_customers)
+    monetary = np.round(frequency * rng.lognormal(mean=5.5, sigma=0.8, size=n_customers), 2)
+    country = rng.choice(SYNTHETIC_COUNTRIES, size=n_customers, p=SYNTHETIC_COUNTRY_WEIGHTS)
+
+    # Active customers (many orders) come back sooner
+    recency = rng.exponential(scale=300 / np.sqrt(frequency)).astype(int)
+
+    features_df = pd.DataFrame({
+        "Recency": recency,
+        "Frequency": frequency,
+        "Monetary": monetary,
+        "Country": country
+    })
+    features_df[TARGET_VARIABLE] = (features_df["Recency"] > CHURN_THRESHOLD_DAYS).astype(int)
+    return features_df
+
+
+def make_payloads(n_payloads: int, seed: int = RANDOM_STATE) -> list:
+    """
+    Generates '/predict' request bodies (ChurnInput dicts) from synthetic customers.
+    """
+    features_df = make_customer_features(n_payloads, seed=seed)
+    return [
+        {"Frequency": int(f), "Monetary": float(m), "Country": c}
+        for f, m, c in zip(features_df["Frequency"], features_df["Monetary"], features_df["Country"])
+    ]
+
+
+def fit_synthetic_pipeline(n_customers: int = 2000, seed: int = RANDOM_STATE):
+    """
+    Fits the production pipeline ('create_pipeline()') on synthetic customers,
+    with a drift-monitoring reference profile on held-out customers like 'run_training()' stores.
+
+    return: Fitted scikit-learn Pipeline
+    """
+    features_df = make_customer_features(n_customers, seed=seed)
+    X = features_df.drop(columns=[TARGET_VARIABLE, "Recency"])
+    y = features_df[TARGET_VARIABLE]
+
+    pipeline = create_pipeline()
+    pipeline.fit(X, y)
+    holdout_df = make_customer_features(max(n_customers // 4, 500), seed=seed + 1)
+    X_holdout = holdout_df.drop(columns=[TARGET_VARIABLE, "Recency"])
+    pipeline.reference_profile_ = build_reference_profile(
+        X_holdout, pipeline.predict_proba(X_holdout)[:, 1], DECISION_THRESHOLD)
+    return pipeline
+
+
+def save_synthetic_model(model_path: Path, n_customers: int = 2000, seed: int = RANDOM_STATE) -> Path:
+    """
+    Fits a synthetic pipeline and saves it with joblib, like 'run_training()' does.
+    """
+    pipeline = fit_synthetic_pipeline(n_customers, seed=seed)
+    model_path = Path(model_path)
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    dump(pipeline, model_path)
+    return model_path
+
+
+def make_transactions(n_customers: int = 5000, seed: int = RANDOM_STATE) -> pd.DataFrame:
+    """
+    Generates transaction rows shaped like 'load_and_clean_data()' output (one row per invoice line).
+
+    Invoice counts per customer are heavy-tailed (a few wholesalers with hundreds of orders);
+    invoice numbers are mixed int/str like in the Excel file.
+
+    return: DataFrame with Customer ID, Invoice, InvoiceDate, TotalPrice and Country columns.
+    """
+    rng = np.random.default_rng(seed)
+
+    invoices_per_customer = np.minimum(rng.zipf(a=1.8, size=n_customers), 2000)
+    invoice_customers = np.repeat(np.arange(12000, 12000 + n_customers), invoices_per_customer)
+    invoice_numbers = (rng.permutation(len(invoice_customers)) + 489000).astype(object)
+    invoice_numbers[::7] = invoice_numbers[::7].astype(str)
+    lines_per_invoice = rng.geometric(p=0.05, size=len(invoice_customers))
+
+    customer_country = dict(zip(
+        range(12000, 12000 + n_customers),
+        rng.choice(SYNTHETIC_COUNTRIES, size=n_customers, p=SYNTHETIC_COUNTRY_WEIGHTS)
+    ))
+    customers = np.repeat(invoice_customers, lines_per_invoice)
+    invoices = np.repeat(invoice_numbers, lines_per_invoice)
+
+    return pd.DataFrame({
+        COL_CUSTOMER_ID: customers.astype(float),
+        COL_INVOICE: invoices,
+        COL_INVOICE_DATE: pd.Timestamp("2011-12-09") - pd.to_timedelta(rng.integers(0, 730, len(customers)), unit="D"),
+        "TotalPrice": np.round(rng.lognormal(mean=2.5, sigma=1.0, size=len(customers)), 2),
+        COL_COUNTRY: pd.Series(customers).map(customer_country).to_numpy()
+    })
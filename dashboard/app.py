@@ -1,12 +1,117 @@
 # dashboard/app.py
 
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from src.config import INPUT_COLUMNS, MIN_FREQUENCY, MIN_MONETARY
 
 # --- API and Model Information ---
 
-API_URL = "http://localhost:8000/predict"
+API_BASE_URL = os.getenv("CHURN_API_URL", "http://localhost:8000")
+API_URL = f"{API_BASE_URL}/predict"
+BATCH_API_URL = f"{API_BASE_URL}/predict/columnar"
+
+# --- Bulk Scoring Settings ---
+BULK_CHUNK_SIZE = 500     # customers per chunk (one request each)
+BULK_MAX_WORKERS = 8      # chunks scored concurrently (= HTTP connection pool size)
+REQUEST_TIMEOUT = 10      # seconds
+CACHE_TTL = 600           # seconds a cached prediction is reused
+
+
+# --- HTTP Client (pooled, shared across reruns) ---
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    One 'requests.Session' for the whole dashboard process.
+    Keep-alive connections are reused instead of opening a new one per click / per customer.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BULK_MAX_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def predict_customer(frequency: int, monetary: float, country: str) -> dict:
+    """
+    Scores one customer. Repeated lookups of the same customer are served from the cache.
+    """
+    api_input = {
+        "Frequency": frequency,
+        "Monetary": monetary,
+        "Country": country
+    }
+    response = get_http_session().post(API_URL, json=api_input, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def score_chunk(records: tuple) -> list:
+    """
+    Scores one chunk of (Frequency, Monetary, Country) records with a single '/predict/columnar'
+    request through the pooled session. Re-uploading the same file hits the cache instead of the API.
+    """
+    api_input = {column: list(values) for column, values in zip(INPUT_COLUMNS, zip(*records))}
+    response = get_http_session().post(BATCH_API_URL, json=api_input, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()["CHURN"]
+
+
+def _timed_score_chunk(chunk_id: int, records: tuple, script_ctx) -> tuple:
+    # Worker threads need the script context to use Streamlit's caches
+    add_script_run_ctx(ctx=script_ctx)
+    start = time.perf_counter()
+    predictions = score_chunk(records)
+    return chunk_id, predictions, (time.perf_counter() - start) * 1000.0
+
+
+def load_customers_csv(uploaded_file) -> tuple:
+    """
+    Reads the uploaded CSV, checks that it has the columns our API expects and separates the rows
+    the API would reject (same ranges as 'ChurnInput': MIN_FREQUENCY / MIN_MONETARY in config.py),
+    so one bad row cannot fail a whole chunk.
+
+    return: (valid customers, rejected rows with a 'Reason' column)
+    """
+    customers = pd.read_csv(uploaded_file)
+    missing = [col for col in INPUT_COLUMNS if col not in customers.columns]
+    if missing:
+        raise ValueError(f"The CSV is missing the column(s): {', '.join(missing)}")
+
+    frequency = pd.to_numeric(customers["Frequency"], errors="coerce")
+    monetary = pd.to_numeric(customers["Monetary"], errors="coerce")
+    country = customers["Country"].astype("string").str.strip()
+
+    # First matching reason per row (checked in this order)
+    checks = [
+        (frequency.isna(), "Frequency is missing or not a number"),
+        (frequency != frequency.round(), "Frequency is not a whole number"),
+        (frequency < MIN_FREQUENCY, f"Frequency < {MIN_FREQUENCY}"),
+        (monetary.isna() | ~monetary.abs().lt(float("inf")), "Monetary is missing or not a finite number"),
+        (monetary <= MIN_MONETARY, f"Monetary <= {MIN_MONETARY:g} (e.g. returns / credit notes)"),
+        (country.isna() | (country == ""), "Country is missing"),
+    ]
+    reason = pd.Series(pd.NA, index=customers.index, dtype="string")
+    for failed, message in checks:
+        reason = reason.mask(reason.isna() & failed.fillna(False), message)
+
+    rejected = customers[reason.notna()].assign(Reason=reason[reason.notna()])
+    valid = customers[reason.isna()].copy()
+    valid["Frequency"] = frequency[reason.isna()].astype(int)
+    valid["Monetary"] = monetary[reason.isna()].astype(float)
+    valid["Country"] = customers.loc[reason.isna(), "Country"].astype(str)
+    return valid.reset_index(drop=True), rejected.reset_index(drop=True)
+
 
 # --- Streamlit Interface ---
 
@@ -23,70 +128,168 @@ st.write(
     "The API is running in a separate Docker container."
 )
 
+single_tab, bulk_tab = st.tabs(["Single Customer", "Bulk (CSV)"])
+
 # --- User Input (Input Form) ---
-st.header("Enter Customer's RFM Features:")
-st.write(
-    "These are the *engineered features* that our API expects, "
-    "not the raw data."
-)
+with single_tab:
+    st.header("Enter Customer's RFM Features:")
+    st.write(
+        "These are the *engineered features* that our API expects, "
+        "not the raw data."
+    )
 
-# Split the form into columns
-col1, col2 = st.columns(2)
+    # Split the form into columns
+    col1, col2 = st.columns(2)
 
-with col1:
-    # According to the 'ChurnInput' model in app/schema.py
-    frequency = st.number_input("Frequency (Total Invoices)",
-                                min_value=1, value=5, step=1)
+    with col1:
+        # According to the 'ChurnInput' model in app/schema.py
+        frequency = st.number_input("Frequency (Total Invoices)",
+                                    min_value=MIN_FREQUENCY, value=5, step=1)
 
-    country = st.text_input("Country",
-                          value="United Kingdom")
+        country = st.text_input("Country",
+                                value="United Kingdom")
 
-with col2:
-    monetary = st.number_input("Monetary (Total Spend)",
-                              min_value=0.01, value=150.75, format="%.2f")
+    with col2:
+        monetary = st.number_input("Monetary (Total Spend)",
+                                   min_value=0.01, value=150.75, format="%.2f")
 
+    # --- Prediction Button and API Request ---
 
-# --- Prediction Button and API Request ---
+    if st.button("💔 Predict Churn Status"):
 
-if st.button("💔 Predict Churn Status"):
+        # 1. Convert user input to the JSON format our API expects
+        api_input = {
+            "Frequency": frequency,
+            "Monetary": monetary,
+            "Country": country
+        }
 
-    # 1. Convert user input to the JSON format our API expects
-    api_input = {
-        "Frequency": frequency,
-        "Monetary": monetary,
-        "Country": country
-    }
+        try:
+            # 2. Send a POST request to FastAPI (cached, through the pooled session)
+            prediction = predict_customer(int(frequency), float(monetary), country)
+
+            # 3. Retrieve JSON response from API
+            churn_status = prediction.get("CHURN")
+
+            # 4. Print the result beautifully on the screen
+            if churn_status == 1:
+                st.error("### 💔 **Prediction: CHURN** 💔")
+                st.write("This customer is likely to churn.")
+            else:
+                st.success("### 🎉 **Prediction: NO CHURN** 🎉")
+                st.write("This customer is likely to stay.")
+
+            st.write("---")
+
+            st.subheader("API Response (JSON):")
+            st.json(prediction)
+
+        except requests.exceptions.ConnectionError:
+            st.error(
+                "Connection Error: Could not connect to the API (v3.0).\n\n"
+                "**Is the FastAPI Docker container running?**\n\n"
+                "Please run the following command in a separate terminal:\n\n"
+                "`docker run -d --rm -p 8000:80 -v ${pwd}/models:/app/models titanic-api:v3`"
+            )
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
+            st.subheader("Data Sent (JSON):")
+            st.json(api_input)
+
+# --- Bulk Mode (CSV Upload) ---
+with bulk_tab:
+    st.header("Score a List of Customers:")
+    st.write(
+        f"Upload a CSV with the columns {', '.join(INPUT_COLUMNS)}. "
+        f"Customers are scored in chunks of {BULK_CHUNK_SIZE}, "
+        f"{BULK_MAX_WORKERS} chunks at a time; progress is shown as each chunk finishes."
+    )
+
+    uploaded_file = st.file_uploader("Customers CSV", type="csv")
+
+    if uploaded_file is not None and st.button("💔 Predict Churn for All Customers"):
+        try:
+            customers, rejected = load_customers_csv(uploaded_file)
+        except Exception as e:
+            st.error(f"Could not read the CSV: {e}")
+            st.stop()
+
+        if not rejected.empty:
+            st.warning(f"{len(rejected)} row(s) are outside the model's input range and were not scored.")
+            with st.expander("Rejected rows"):
+                st.dataframe(rejected)
+            st.download_button("Download Rejected Rows (CSV)",
+                               data=rejected.to_csv(index=False),
+                               file_name="churn_rejected_rows.csv",
+                               mime="text/csv")
+
+        if customers.empty:
+            st.warning("The CSV does not contain any valid customers to score.")
+            st.stop()
+
+        # Duplicate customers (same F, M, Country) are scored only once
+        unique_records = list(customers[INPUT_COLUMNS].drop_duplicates().itertuples(index=False, name=None))
+        chunks = [tuple(unique_records[i:i + BULK_CHUNK_SIZE])
+                  for i in range(0, len(unique_records), BULK_CHUNK_SIZE)]
+        st.write(f"{len(customers)} customers ({len(unique_records)} unique) in {len(chunks)} chunks.")
+
+        progress = st.progress(0.0)
+        results_placeholder = st.empty()
+        latency_placeholder = st.empty()
+
+        scored_chunks = []
+        n_scored = 0
+        chunk_latencies = []
+        failed_chunks = []
+        script_ctx = get_script_run_ctx()
+
+        with ThreadPoolExecutor(max_workers=BULK_MAX_WORKERS) as executor:
+            futures = {executor.submit(_timed_score_chunk, chunk_id, chunk, script_ctx): chunk_id
+                       for chunk_id, chunk in enumerate(chunks)}
+
+            # Only a running count and the chunk latencies are streamed (O(chunk) per update); the results
+            # are joined to the customers once at the end. A failed chunk is reported, the others are kept
+            for done, future in enumerate(as_completed(futures), start=1):
+                progress.progress(done / len(chunks))
+                try:
+                    chunk_id, predictions, latency_ms = future.result()
+                except requests.exceptions.ConnectionError:
+                    failed_chunks.append({"chunk": futures[future], "customers": len(chunks[futures[future]]),
+                                          "error": "Could not connect to the API"})
+                    continue
+                except Exception as e:
+                    failed_chunks.append({"chunk": futures[future], "customers": len(chunks[futures[future]]),
+                                          "error": str(e)})
+                    continue
+
+                scored_chunks.append(pd.DataFrame(list(chunks[chunk_id]), columns=INPUT_COLUMNS)
+                                     .assign(CHURN=predictions))
+                n_scored += len(predictions)
+                chunk_latencies.append({"chunk": chunk_id, "customers": len(chunks[chunk_id]),
+                                        "latency_ms": round(latency_ms, 1)})
+
+                results_placeholder.write(f"Scored {n_scored} of {len(unique_records)} unique customers...")
+                latency_placeholder.dataframe(pd.DataFrame(chunk_latencies).set_index("chunk"))
+
+        if failed_chunks:
+            st.error(f"{len(failed_chunks)} of {len(chunks)} chunk(s) could not be scored "
+                     f"(is the FastAPI container running?). The other results are kept.")
+            st.dataframe(pd.DataFrame(failed_chunks).set_index("chunk"))
+        if not chunk_latencies:
+            st.stop()
 
-    try:
-        # 2. Send a POST request to FastAPI (http://localhost:8000/predict)
-        response = requests.post(API_URL, json=api_input)
-        response.raise_for_status()
-
-        # 3. Retrieve JSON response from API
-        prediction = response.json()
-        churn_status = prediction.get("CHURN")
-
-        # 4. Print the result beautifully on the screen
-        if churn_status == 1:
-            st.error("### 💔 **Prediction: CHURN** 💔")
-            st.write("This customer is likely to churn.")
-        else:
-            st.success("### 🎉 **Prediction: NO CHURN** 🎉")
-            st.write("This customer is likely to stay.")
-
-        st.write("---")
-
-        st.subheader("API Response (JSON):")
-        st.json(prediction)
-
-    except requests.exceptions.ConnectionError:
-        st.error(
-            "Connection Error: Could not connect to the API (v3.0).\n\n"
-            "**Is the FastAPI Docker container running?**\n\n"
-            "Please run the following command in a separate terminal:\n\n"
-            "`docker run -d --rm -p 8000:80 -v ${pwd}/models:/app/models titanic-api:v3`"
+        # One merge of the unique predictions back onto all customers (duplicates share a prediction;
+        # customers of failed chunks keep an empty CHURN)
+        results = customers.merge(pd.concat(scored_chunks, ignore_index=True), on=INPUT_COLUMNS, how="left")
+        results_placeholder.dataframe(results)
+        scored_customers = results.dropna(subset=["CHURN"])
+        latencies = pd.DataFrame(chunk_latencies)["latency_ms"]
+        st.success(
+            f"Scored {len(scored_customers)} of {len(customers)} customers. "
+            f"Churn rate: {scored_customers['CHURN'].mean():.1%}. "
+            f"Chunk latency p50 / max: {latencies.median():.0f} / {latencies.max():.0f} ms."
         )
-    except Exception as e:
-        st.error(f"An error occurred: {e}")
-        st.subheader("Data Sent (JSON):")
-        st.json(api_input)
\ No newline at end of file
+        st.download_button("Download Predictions (CSV)",
+                           data=results.to_csv(index=False),
+                           file_name="churn_predictions.csv",
+                           mime="text/csv")
@@ -18,6 +18,12 @@ ENGINEERED_DATA_PATH = PROJECT_ROOT / "data" / "processed" / "customer_features.
 # --- Model Output Path ---
 MODEL_OUTPUT_PATH = PROJECT_ROOT / "models" / "churn_model.joblib"
 
+# --- Inference-Optimized Export (native booster + folded preprocessing) ---
+EXPORT_DIR = PROJECT_ROOT / "models" / "native"
+
+# --- MLflow Model Directory (pyfunc wrapper around the joblib file, logged as 'model_churn') ---
+MLFLOW_MODEL_DIR = PROJECT_ROOT / "models" / "mlflow_model"
+
 # --- Prediction Output Path ---
 SUBMISSION_PATH = PROJECT_ROOT / "reports" / "churn_predictions.csv"
 
@@ -41,6 +47,12 @@ RFM_M_BINS = [0, 100, 500, 1000, 2000, 100000] # Monetary
 # CHURN DEFINITION: If X days have passed since your last purchase
 CHURN_THRESHOLD_DAYS = 60
 
+# Frequency = distinct invoices per customer: 'exact' (nunique) or 'hll' (mergeable HyperLogLog sketches)
+FREQUENCY_MODE = "exact"
+HLL_PRECISION = 8  # 2^8 = 256 one-byte registers per customer (~6.5% relative error on large counts)
+HLL_CHUNK_SIZE = 100_000  # transaction rows per partial sketch (partial sketches are merged)
+HLL_N_JOBS = 1  # partial sketches built in parallel (joblib)
+
 
 # === 4. Model and Pipeline Settings ===
 
@@ -51,14 +63,70 @@ TARGET_VARIABLE = "CHURN"
 NUMERICAL_FEATURES = ["Frequency", "Monetary"]
 CATEGORICAL_FEATURES = ["Country"]
 
+# The columns of one API request (the 'ChurnInput' model in app/schema.py, one array each in '/predict/columnar')
+INPUT_COLUMNS = NUMERICAL_FEATURES + CATEGORICAL_FEATURES
+
 
 # === 5. Other Settings ===
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
 
+# Share of the training set held out as validation split (tree-count pruning)
+VALIDATION_SIZE = 0.2
+
+# Pruning stops after this many boosting rounds without validation logloss improvement
+PRUNE_PATIENCE = 10
+
+# Cross-validation evaluation mode (stratified k-fold, folds fitted in parallel)
+CV_FOLDS = 5
+CV_N_JOBS = -1  # -1 = all CPU cores
+CV_CONFIDENCE = 0.95
+
+# Early stopping training mode: stop boosting after this many rounds without validation logloss improvement
+EARLY_STOPPING_ROUNDS = 20
+
+# Max. allowed |P(native) - P(pipeline)| for the exported artifact
+EXPORT_FIDELITY_TOLERANCE = 1e-5
+
 # MLFlow (v2.0)
 MLFLOW_EXPERIMENT_NAME = "Customer Churn Prediction"
 
+# Valid input range of a customer, shared by feature engineering, both prediction endpoints and the dashboard.
+# Customers outside it (no invoices, zero/negative net spend from credit notes and returns) are dropped
+# before training, so the model has never seen them.
+MIN_FREQUENCY = 1  # Frequency >= MIN_FREQUENCY
+MIN_MONETARY = 0.0  # Monetary > MIN_MONETARY
+
+# The same range as one rule per numerical feature (both endpoints build their checks from this table):
+# 'min' = lower bound, 'inclusive' = the bound itself is valid, 'integer' = whole numbers only.
+# A numerical feature without a rule accepts any finite number.
+NUMERICAL_INPUT_RULES = {
+    "Frequency": {"min": MIN_FREQUENCY, "inclusive": True, "integer": True},
+    "Monetary": {"min": MIN_MONETARY, "inclusive": False, "integer": False},
+}
+
+# Max. rows in one '/predict/columnar' request
+COLUMNAR_MAX_ROWS = 100_000
+
+# Background MLflow logging: flush buffered params/metrics every N seconds or at N entries
+MLFLOW_FLUSH_INTERVAL = 2.0
+MLFLOW_MAX_BATCH_SIZE = 500
+
+# Drift monitoring in the API: reference bins/categories saved with the model at training time
+DRIFT_N_BINS = 10  # quantile bins per numerical feature
+DRIFT_MAX_CATEGORIES = 20  # most frequent categories tracked, the rest fall into one 'other' bucket
+DRIFT_MIN_SAMPLES = 100  # live rows needed before drift is judged
+DRIFT_REPORT_INTERVAL = 30.0  # seconds a computed drift report is reused
+DRIFT_PSI_WARNING = 0.1
+DRIFT_PSI_ALERT = 0.25
+
+# Decision threshold on P(CHURN) used when the model carries no tuned threshold
+DECISION_THRESHOLD = 0.5
+
+# Thresholds evaluated by the post-training sweep (start, stop, number of points)
+THRESHOLD_SWEEP_RANGE = (0.05, 0.95)
+THRESHOLD_SWEEP_STEPS = 91
+
 # === 6. Model Hyperparameters ===
 
 XGB_PARAMS = {
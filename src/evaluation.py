@@ -0,0 +1,208 @@
+# src/evaluation.py
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, dump, load
+from scipy import stats
+from sklearn.metrics import f1_score, log_loss, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from src.config import (
+    NUMERICAL_FEATURES,
+    CATEGORICAL_FEATURES,
+    RANDOM_STATE,
+    DECISION_THRESHOLD,
+    THRESHOLD_SWEEP_RANGE,
+    THRESHOLD_SWEEP_STEPS,
+    CV_FOLDS,
+    CV_N_JOBS,
+    CV_CONFIDENCE
+)
+from src.pipeline import create_pipeline
+
+
+def sweep_thresholds(y_true, churn_proba, thresholds=None) -> pd.DataFrame:
+    """
+    Evaluates precision, recall and F1 for many decision thresholds at once.
+
+    The probabilities are sorted once; the confusion matrix for every threshold
+    then comes from a cumulative sum and a 'searchsorted' (no loop, no refitting,
+    no second 'predict' call). A sample is predicted as CHURN when proba >= threshold.
+
+    return: DataFrame with one row per threshold (threshold, precision, recall, f1)
+    """
+    if thresholds is None:
+        thresholds = np.linspace(*THRESHOLD_SWEEP_RANGE, THRESHOLD_SWEEP_STEPS)
+    thresholds = np.asarray(thresholds, dtype=float)
+
+    y_true = np.asarray(y_true).astype(bool)
+    churn_proba = np.asarray(churn_proba, dtype=float)
+
+    order = np.argsort(churn_proba, kind="mergesort")
+    sorted_proba = churn_proba[order]
+    sorted_true = y_true[order]
+
+    # positives_from[i] = number of actual churners among sorted samples i..n-1
+    positives_from = np.append(np.cumsum(sorted_true[::-1])[::-1], 0)
+
+    first_predicted = np.searchsorted(sorted_proba, thresholds, side="left")
+    tp = positives_from[first_predicted]
+    predicted_positive = len(sorted_proba) - first_predicted
+    fp = predicted_positive - tp
+    fn = y_true.sum() - tp
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1
+    })
+
+
+def choose_threshold(sweep: pd.DataFrame) -> float:
+    """
+    Picks the threshold with the highest F1 from 'sweep_thresholds()' (lowest threshold on ties).
+    """
+    return float(sweep.loc[sweep["f1"].idxmax(), "threshold"])
+
+
+# === Cross-Validation ===
+
+def _encode_features(X: pd.DataFrame) -> tuple:
+    """
+    Packs the features into one float64 matrix (categories -> integer codes, missing -> NaN),
+    so all CV workers can share a single memory-mapped copy.
+
+    return: (matrix, {categorical feature: array of category labels})
+    """
+    columns = [X[feature].to_numpy(dtype=np.float64) for feature in NUMERICAL_FEATURES]
+    categories = {}
+    for feature in CATEGORICAL_FEATURES:
+        codes, labels = pd.factorize(X[feature])
+        columns.append(np.where(codes >= 0, codes, np.nan))
+        categories[feature] = np.asarray(labels, dtype=object)
+    return np.column_stack(columns), categories
+
+
+def _decode_features(matrix: np.ndarray, rows: np.ndarray, categories: dict) -> pd.DataFrame:
+    """
+    Rebuilds the original feature DataFrame for the selected rows of the shared matrix.
+    """
+    block = np.asarray(matrix[rows])
+    X = pd.DataFrame(block[:, :len(NUMERICAL_FEATURES)], columns=NUMERICAL_FEATURES)
+    for i, feature in enumerate(CATEGORICAL_FEATURES, start=len(NUMERICAL_FEATURES)):
+        codes = block[:, i]
+        known = ~np.isnan(codes)
+        labels = np.full(len(rows), np.nan, dtype=object)
+        labels[known] = categories[feature][codes[known].astype(int)]
+        X[feature] = labels
+    return X
+
+
+def _fit_and_score_fold(matrix, y, categories: dict, train_rows, test_rows, single_threaded: bool) -> dict:
+    """
+    Fits a fresh 'create_pipeline()' on one fold and scores it on the held-out rows.
+
+    single_threaded: Limit XGBoost to one thread (when the parallelism comes from the folds);
+                     otherwise XGBoost keeps its default threading (all cores), like a normal fit.
+    """
+    pipeline = create_pipeline()
+    if single_threaded:
+        pipeline.set_params(classifier__n_jobs=1)
+    pipeline.fit(_decode_features(matrix, train_rows, categories), y[train_rows])
+
+    y_test = y[test_rows]
+    churn_proba = pipeline.predict_proba(_decode_features(matrix, test_rows, categories))[:, 1]
+    return {
+        "f1": f1_score(y_test, (churn_proba >= DECISION_THRESHOLD).astype(int)),
+        "logloss": log_loss(y_test, churn_proba, labels=[0, 1]),
+        "auc": roc_auc_score(y_test, churn_proba)
+    }
+
+
+def summarize_folds(fold_scores: list, confidence: float = CV_CONFIDENCE) -> dict:
+    """
+    Mean, standard deviation and Student-t confidence interval of every metric across folds.
+
+    return: {"f1_mean", "f1_std", "f1_ci_low", "f1_ci_high", ...}
+    """
+    scores = pd.DataFrame(fold_scores)
+    t_value = stats.t.ppf((1 + confidence) / 2, df=len(scores) - 1)
+
+    summary = {}
+    for metric in scores.columns:
+        mean, std = scores[metric].mean(), scores[metric].std(ddof=1)
+        half_width = t_value * std / np.sqrt(len(scores))
+        summary[f"{metric}_mean"] = float(mean)
+        summary[f"{metric}_std"] = float(std)
+        summary[f"{metric}_ci_low"] = float(mean - half_width)
+        summary[f"{metric}_ci_high"] = float(mean + half_width)
+    return summary
+
+
+def _describe_cv_setup(n_jobs: int) -> str:
+    if n_jobs == 1:
+        return "folds one at a time, XGBoost multi-threaded (default n_jobs)"
+    return f"folds in parallel (n_jobs={n_jobs}), XGBoost single-threaded"
+
+
+def cross_validate_parallel(X: pd.DataFrame, y, n_splits: int = CV_FOLDS, n_jobs: int = CV_N_JOBS,
+                            compare_serial: bool = False) -> dict:
+    """
+    Stratified k-fold cross-validation with the folds fitted in parallel.
+
+    The features are encoded once into a numeric matrix and dumped to a memory-mapped file;
+    every worker opens the same file read-only instead of receiving its own pickled copy.
+
+    compare_serial: Also run the folds one after another with XGBoost's default multi-threading
+                    (the usual serial setup) and report both wall times.
+
+    return: {"folds": per-fold scores, "summary": summarize_folds(...), "wall_time_s", "setup", ...}
+    """
+    matrix, categories = _encode_features(X)
+    y = np.asarray(y)
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=RANDOM_STATE).split(matrix, y))
+
+    # (ignore_cleanup_errors: on Windows the memmap files stay locked until the workers release them)
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        dump(matrix, Path(tmp_dir) / "X.joblib")
+        dump(y, Path(tmp_dir) / "y.joblib")
+        shared_X = load(Path(tmp_dir) / "X.joblib", mmap_mode="r")
+        shared_y = load(Path(tmp_dir) / "y.joblib", mmap_mode="r")
+
+        def run_folds(X_shared, y_shared, jobs: int) -> tuple:
+            # Fold-level parallelism -> single-threaded XGBoost (no oversubscription);
+            # folds one at a time -> XGBoost's own multi-threading
+            single_threaded = jobs != 1
+            start = time.perf_counter()
+            scores = Parallel(n_jobs=jobs)(
+                delayed(_fit_and_score_fold)(X_shared, y_shared, categories, train_rows, test_rows, single_threaded)
+                for train_rows, test_rows in folds
+            )
+            return scores, time.perf_counter() - start
+
+        fold_scores, wall_time = run_folds(shared_X, shared_y, n_jobs)
+        result = {
+            "folds": fold_scores,
+            "summary": summarize_folds(fold_scores),
+            "wall_time_s": wall_time,
+            "setup": _describe_cv_setup(n_jobs)
+        }
+        if compare_serial:
+            _, serial_wall_time = run_folds(shared_X, shared_y, 1)
+            result["serial_wall_time_s"] = serial_wall_time
+            result["serial_setup"] = _describe_cv_setup(1)
+            result["speedup"] = serial_wall_time / wall_time
+
+        # Release the memmaps before the temporary directory is removed
+        del shared_X, shared_y
+    return result
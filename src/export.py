@@ -0,0 +1,312 @@
+# src/export.py
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.config import (
+    NUMERICAL_FEATURES,
+    CATEGORICAL_FEATURES,
+    DECISION_THRESHOLD,
+    PRUNE_PATIENCE
+)
+
+BOOSTER_FILE_NAME = "booster.ubj"
+PREPROCESSOR_FILE_NAME = "preprocessor.json"
+
+
+def normalize_category(value) -> str:
+    """
+    Normalization used by 'CategoryIndex': collapsed whitespace, case-insensitive ('  united  KINGDOM' -> 'united kingdom').
+    """
+    return " ".join(str(value).split()).casefold()
+
+
+class CategoryIndex:
+    """
+    Serving-side vocabulary of one categorical feature: category -> one-hot column position.
+
+    Built once from the fitted OneHotEncoder categories. Exact strings hit a plain dict; other
+    spellings are normalized (case, whitespace) and looked up in an interned normalized dict.
+    Batches are factorized first, so each distinct value is looked up only once
+    (this keeps high-cardinality features cheap). Unknown values count towards 'n_unknown'.
+    """
+
+    def __init__(self, categories, fill_value=None):
+        self.categories = list(categories)
+        self._exact = {category: position for position, category in enumerate(self.categories)}
+        self._normalized = {}
+        for position, category in enumerate(self.categories):
+            self._normalized.setdefault(sys.intern(normalize_category(category)), position)
+
+        # Missing values are imputed with the training mode (like SimpleImputer(strategy='most_frequent'))
+        self.fill_position = -1 if fill_value is None else self.position(fill_value)
+
+        self.n_lookups = 0
+        self.n_unknown = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def position(self, value) -> int:
+        """
+        return: one-hot position of a single value, -1 if unknown
+        """
+        position = self._exact.get(value)
+        if position is None:
+            position = self._normalized.get(normalize_category(value), -1)
+        return position
+
+    def lookup(self, values) -> np.ndarray:
+        """
+        return: one-hot positions (int array, -1 = unknown) for an array of values
+        """
+        values = np.asarray(values, dtype=object)
+        if values.shape == (1,) and isinstance(values[0], str):
+            # Single request: one dict lookup, no factorization
+            positions = np.array([self.position(values[0])], dtype=np.int64)
+        else:
+            codes, uniques = pd.factorize(values)
+            unique_positions = np.fromiter((self.position(value) for value in uniques), dtype=np.int64,
+                                           count=len(uniques))
+            positions = np.where(codes >= 0, unique_positions[codes], self.fill_position)
+
+        n_unknown = int(np.count_nonzero(positions < 0))
+        with self._lock:
+            self.n_lookups += len(positions)
+            self.n_unknown += n_unknown
+        return positions
+
+    def stats(self) -> dict:
+        with self._lock:
+            n_lookups, n_unknown = self.n_lookups, self.n_unknown
+        return {
+            "vocabulary_size": len(self),
+            "lookups": n_lookups,
+            "unknown": n_unknown,
+            "unknown_rate": n_unknown / n_lookups if n_lookups else 0.0
+        }
+
+
+class FoldedPreprocessor:
+    """
+    The fitted 'preprocessor' (ColumnTransformer) of our pipeline, folded into plain NumPy arithmetic.
+
+    - Numerical features: median imputation + standard scaling -> (x - mean) / scale
+    - Categorical features: mode imputation + one-hot encoding (unknown categories -> all zeros),
+      the one-hot position comes from a 'CategoryIndex' (case/whitespace-insensitive)
+
+    The output has the same column layout as 'ColumnTransformer.transform()' and is float32,
+    the precision XGBoost works in.
+    """
+
+    def __init__(self, numeric: dict, categorical: dict):
+        # numeric: {"features", "medians", "means", "scales"}
+        # categorical: {feature: {"fill_value", "categories"}}
+        self.numeric = numeric
+        self.categorical = categorical
+        self._medians = np.asarray(numeric["medians"], dtype=np.float64)
+        self._means = np.asarray(numeric["means"], dtype=np.float64)
+        self._scales = np.asarray(numeric["scales"], dtype=np.float64)
+
+        self.n_features_out = len(numeric["features"])
+        self._offsets = {}
+        self.indexes = {}
+        for feature, spec in categorical.items():
+            self._offsets[feature] = self.n_features_out
+            self.indexes[feature] = CategoryIndex(spec["categories"], spec["fill_value"])
+            self.n_features_out += len(spec["categories"])
+
+    @classmethod
+    def from_pipeline(cls, pipeline) -> "FoldedPreprocessor":
+        """
+        Reads the learned statistics out of a fitted 'create_pipeline()' pipeline.
+        """
+        preprocessor = pipeline.named_steps["preprocessor"]
+        num_steps = preprocessor.named_transformers_["num"].named_steps
+        cat_steps = preprocessor.named_transformers_["cat"].named_steps
+
+        numeric = {
+            "features": list(NUMERICAL_FEATURES),
+            "medians": num_steps["imputer"].statistics_.tolist(),
+            "means": num_steps["scaler"].mean_.tolist(),
+            "scales": num_steps["scaler"].scale_.tolist()
+        }
+        categorical = {
+            feature: {
+                "fill_value": fill_value,
+                "categories": categories.tolist()
+            }
+            for feature, fill_value, categories in zip(
+                CATEGORICAL_FEATURES,
+                cat_steps["imputer"].statistics_,
+                cat_steps["onehot"].categories_
+            )
+        }
+        return cls(numeric, categorical)
+
+    def to_dict(self) -> dict:
+        return {"numeric": self.numeric, "categorical": self.categorical}
+
+    def transform(self, columns) -> np.ndarray:
+        """
+        Transforms a DataFrame (or any mapping of column name -> array) into the model's input matrix.
+        """
+        numeric_values = np.column_stack([
+            np.asarray(columns[feature], dtype=np.float64) for feature in self.numeric["features"]
+        ])
+        n_rows = numeric_values.shape[0]
+        matrix = np.zeros((n_rows, self.n_features_out), dtype=np.float32)
+
+        numeric_values = np.where(np.isnan(numeric_values), self._medians, numeric_values)
+        matrix[:, :len(self._means)] = (numeric_values - self._means) / self._scales
+
+        rows = np.arange(n_rows)
+        for feature, index in self.indexes.items():
+            positions = index.lookup(columns[feature])
+            known = positions >= 0
+            matrix[rows[known], self._offsets[feature] + positions[known]] = 1.0
+        return matrix
+
+    def category_stats(self) -> dict:
+        """
+        return: {categorical feature: vocabulary size, lookups, unknown count and rate}
+        """
+        return {feature: index.stats() for feature, index in self.indexes.items()}
+
+
+class NativeChurnPredictor:
+    """
+    Inference-optimized model: the native XGBoost booster (UBJSON) + the folded NumPy preprocessor.
+    Needs neither scikit-learn nor the joblib pipeline at prediction time.
+    """
+
+    def __init__(self, booster: xgb.Booster, preprocessor: FoldedPreprocessor,
+                 threshold: float = DECISION_THRESHOLD):
+        self.booster = booster
+        self.preprocessor = preprocessor
+        self.threshold = threshold
+
+    @classmethod
+    def load(cls, export_dir: Path) -> "NativeChurnPredictor":
+        export_dir = Path(export_dir)
+        booster = xgb.Booster(model_file=str(export_dir / BOOSTER_FILE_NAME))
+        spec = json.loads((export_dir / PREPROCESSOR_FILE_NAME).read_text())
+        preprocessor = FoldedPreprocessor(spec["numeric"], spec["categorical"])
+        return cls(booster, preprocessor, threshold=spec["threshold"])
+
+    def predict_proba(self, columns) -> np.ndarray:
+        """
+        return: P(CHURN=1) for every row (1-D array)
+        """
+        return self.booster.inplace_predict(self.preprocessor.transform(columns))
+
+    def predict(self, columns) -> np.ndarray:
+        return (self.predict_proba(columns) >= self.threshold).astype(int)
+
+
+def find_pruned_tree_count(pipeline, patience: int = PRUNE_PATIENCE) -> tuple:
+    """
+    Tree-count pruning by early stopping on the validation split.
+
+    Reads the validation logloss that XGBoost recorded for every boosting round while training
+    (the pipeline must be trained with 'fit_with_eval_set') and stops once it has not improved
+    for 'patience' rounds - no extra prediction pass per candidate tree count.
+
+    return: (number of trees to keep, validation logloss per round up to the stop)
+    """
+    classifier = pipeline.named_steps["classifier"]
+    evals_result = getattr(classifier, "evals_result_", {})
+    if "validation_0" not in evals_result:
+        raise ValueError("Tree-count pruning needs the validation curve: train the pipeline with 'fit_with_eval_set'.")
+
+    curve = []
+    best_count, best_loss = 1, np.inf
+    for n_trees, val_logloss in enumerate(evals_result["validation_0"]["logloss"], start=1):
+        curve.append(val_logloss)
+        if val_logloss < best_loss:
+            best_count, best_loss = n_trees, val_logloss
+        elif n_trees - best_count >= patience:
+            break
+    return best_count, curve
+
+
+def pruned_churn_proba(pipeline, X: pd.DataFrame, n_trees: int = None) -> np.ndarray:
+    """
+    return: P(CHURN=1) of the pipeline restricted to its first 'n_trees' trees (all trees if None)
+    """
+    classifier = pipeline.named_steps["classifier"]
+    if n_trees is None:
+        n_trees = classifier.get_booster().num_boosted_rounds()
+    X_matrix = pipeline.named_steps["preprocessor"].transform(X)
+    return classifier.predict_proba(X_matrix, iteration_range=(0, n_trees))[:, 1]
+
+
+def export_inference_artifact(pipeline, export_dir: Path, n_trees: int = None, threshold: float = None) -> Path:
+    """
+    Writes the inference-optimized artifact: 'booster.ubj' (optionally only the first 'n_trees' trees)
+    and 'preprocessor.json' (folded preprocessing statistics + the decision threshold).
+
+    A pruned booster produces different probabilities than the full model, so it should get its own
+    'threshold' (tuned on its own probabilities); by default the pipeline's threshold is stored.
+    """
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+
+    booster = pipeline.named_steps["classifier"].get_booster()
+    if n_trees is not None and n_trees < booster.num_boosted_rounds():
+        booster = booster[:n_trees]
+    booster.save_model(str(export_dir / BOOSTER_FILE_NAME))
+
+    spec = FoldedPreprocessor.from_pipeline(pipeline).to_dict()
+    spec["threshold"] = threshold if threshold is not None else getattr(pipeline, "decision_threshold_", DECISION_THRESHOLD)
+    spec["n_trees"] = booster.num_boosted_rounds()
+    (export_dir / PREPROCESSOR_FILE_NAME).write_text(json.dumps(spec, indent=2))
+
+    return export_dir
+
+
+def _median_latency_ms(predict, X, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000.0)
+
+
+def compare_with_pipeline(pipeline, predictor: NativeChurnPredictor, X: pd.DataFrame,
+                          repeats: int = 50) -> dict:
+    """
+    Fidelity check and latency/throughput comparison of the exported artifact against the joblib pipeline.
+
+    Fidelity is measured against the pipeline restricted to the same number of trees
+    (so a pruned export must still match exactly); 'decision_agreement' compares the
+    final decisions (each model at its own threshold) with the full, unpruned pipeline.
+    """
+    n_trees = predictor.booster.num_boosted_rounds()
+    reference_proba = pruned_churn_proba(pipeline, X, n_trees)
+    full_proba = pipeline.predict_proba(X)[:, 1]
+    native_proba = predictor.predict_proba(X)
+
+    full_threshold = getattr(pipeline, "decision_threshold_", DECISION_THRESHOLD)
+    single_row = X.head(1)
+    report = {
+        "n_trees": n_trees,
+        "max_abs_proba_diff": float(np.max(np.abs(native_proba - reference_proba))),
+        "decision_agreement": float(np.mean((native_proba >= predictor.threshold) == (full_proba >= full_threshold))),
+        "pipeline_single_ms": _median_latency_ms(pipeline.predict_proba, single_row, repeats),
+        "native_single_ms": _median_latency_ms(predictor.predict_proba, single_row, repeats),
+        "pipeline_batch_ms": _median_latency_ms(pipeline.predict_proba, X, max(repeats // 10, 3)),
+        "native_batch_ms": _median_latency_ms(predictor.predict_proba, X, max(repeats // 10, 3)),
+    }
+    report["pipeline_batch_rows_per_s"] = len(X) / (report["pipeline_batch_ms"] / 1000.0)
+    report["native_batch_rows_per_s"] = len(X) / (report["native_batch_ms"] / 1000.0)
+    return report
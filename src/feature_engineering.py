@@ -1,10 +1,12 @@
 # src/feature_engineering.py
 
+import argparse
 import pandas as pd
 import sys
 from pathlib import Path
 
 from src.data_processing import load_and_clean_data
+from src.sketches import sketch_invoices
 from src.config import (
     PROJECT_ROOT,
     ENGINEERED_DATA_PATH,
@@ -14,17 +16,58 @@ from src.config import (
     COL_INVOICE,
     CHURN_THRESHOLD_DAYS,
     TARGET_VARIABLE,  # 'CHURN'
-    COL_COUNTRY
+    COL_COUNTRY,
+    FREQUENCY_MODE,
+    HLL_PRECISION,
+    HLL_CHUNK_SIZE,
+    HLL_N_JOBS,
+    MIN_FREQUENCY,
+    MIN_MONETARY
 )
 
 
-def create_customer_features() -> pd.DataFrame:
+def calculate_rfm(df: pd.DataFrame, analysis_date: pd.Timestamp, frequency_mode: str = FREQUENCY_MODE,
+                  chunk_size: int = None, n_jobs: int = 1) -> pd.DataFrame:
     """
-    v1.0 - Derives customer-based features (RFM) from raw transaction data.
+    v2.0 - Recency, Frequency, Monetary and Country per customer (indexed by Customer ID).
+
+    frequency_mode:
+    - 'exact': Frequency = nunique() of the invoices
+    - 'hll':   Frequency is estimated from per-customer HyperLogLog sketches (src/sketches.py),
+               built chunk by chunk ('chunk_size', in parallel with 'n_jobs') and merged
+
+    return: RFM DataFrame
+    """
+    if frequency_mode not in ("exact", "hll"):
+        raise ValueError(f"Unknown frequency_mode '{frequency_mode}', expected 'exact' or 'hll'.")
+
+    aggregations = {
+        "Recency": (COL_INVOICE_DATE, lambda x: (analysis_date - x.max()).days),
+        "Frequency": (COL_INVOICE, lambda x: x.nunique()),
+        "Monetary": ('TotalPrice', lambda x: x.sum()),
+        "Country": (COL_COUNTRY, 'first')
+    }
+    if frequency_mode == "exact":
+        return df.groupby(COL_CUSTOMER_ID).agg(**aggregations)
+
+    del aggregations["Frequency"]
+    rfm = df.groupby(COL_CUSTOMER_ID).agg(**aggregations)
+    sketch = sketch_invoices(df, COL_CUSTOMER_ID, COL_INVOICE, HLL_PRECISION, chunk_size, n_jobs)
+    estimate = sketch.estimate().reindex(rfm.index)
+    rfm.insert(1, "Frequency", estimate.round().clip(lower=1).astype(int))
+    return rfm
+
+
+def create_customer_features(frequency_mode: str = FREQUENCY_MODE, chunk_size: int = HLL_CHUNK_SIZE,
+                             n_jobs: int = HLL_N_JOBS) -> pd.DataFrame:
+    """
+    v2.0 - Derives customer-based features (RFM) from raw transaction data.
 
     1. Loads clean transaction data (from data_processing).
     2. Determines the analysis date (from 'config.py').
-    3. Calculates Recency, Frequency, and Monetary for each customer.
+    3. Calculates Recency, Frequency, and Monetary for each customer
+       (Frequency exactly or from HyperLogLog sketches built per 'chunk_size' rows
+       on 'n_jobs' workers and merged, see 'calculate_rfm').
     4. Defines the 'CHURN' target variable based on 'Recency'.
 
     return: Customer-based, ready-to-train DataFrame.
@@ -42,16 +85,10 @@ def create_customer_features() -> pd.DataFrame:
     analysis_date = pd.to_datetime(ANALYSIS_DATE)
 
     # 3. Calculate RFM Properties
-    rfm = df.groupby(COL_CUSTOMER_ID).agg(
-        Recency=(COL_INVOICE_DATE, lambda x: (analysis_date - x.max()).days),
-        Frequency=(COL_INVOICE, lambda x: x.nunique()),
-        Monetary=('TotalPrice', lambda x: x.sum()),
-
-        Country=(COL_COUNTRY, 'first')
-    )
+    rfm = calculate_rfm(df, analysis_date, frequency_mode, chunk_size, n_jobs)
 
     # Zero spend or zero frequency is meaningless, clear them
-    rfm = rfm[(rfm['Monetary'] > 0) & (rfm['Frequency'] > 0)]
+    rfm = rfm[(rfm['Monetary'] > MIN_MONETARY) & (rfm['Frequency'] >= MIN_FREQUENCY)]
     rfm.reset_index(inplace=True)
 
     print(f"RFM features {len(rfm)} are calculated for the customer.")
@@ -87,8 +124,17 @@ def save_customer_features(df: pd.DataFrame):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Customer feature engineering (RFM + CHURN).")
+    parser.add_argument("--frequency-mode", choices=["exact", "hll"], default=FREQUENCY_MODE,
+                        help="Distinct-invoice counting: exact nunique() or HyperLogLog sketches.")
+    parser.add_argument("--chunk-size", type=int, default=HLL_CHUNK_SIZE,
+                        help="'hll' mode: transaction rows per partial sketch (0 = single pass).")
+    parser.add_argument("--n-jobs", type=int, default=HLL_N_JOBS,
+                        help="'hll' mode: partial sketches built in parallel (-1 = all cores).")
+    args = parser.parse_args()
+
     print("--- Launching Feature Engineering Flow ---")
-    features_df = create_customer_features()
+    features_df = create_customer_features(args.frequency_mode, args.chunk_size, args.n_jobs)
     save_customer_features(features_df)
 
     print("\n--- Processed Data Summary (First 5 Rows) ---")
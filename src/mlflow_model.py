@@ -0,0 +1,65 @@
+# src/mlflow_model.py
+
+import shutil
+from importlib.metadata import version
+from pathlib import Path
+
+import joblib
+import mlflow.pyfunc
+import pandas as pd
+from mlflow.models import infer_signature
+
+from src.config import PROJECT_ROOT, DECISION_THRESHOLD, TARGET_VARIABLE
+
+# Packages needed to unpickle and run the pipeline (pinned to the training environment)
+_MODEL_REQUIREMENTS = ["scikit-learn", "xgboost", "pandas", "joblib"]
+
+
+class ChurnPyfuncModel:
+    """
+    MLflow 'python_function' wrapper around the joblib pipeline: same output as the API
+    (CHURN decision at the tuned threshold + CHURN_PROBABILITY).
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.threshold = getattr(pipeline, "decision_threshold_", DECISION_THRESHOLD)
+
+    def predict(self, model_input: pd.DataFrame, params: dict = None) -> pd.DataFrame:
+        churn_proba = self.pipeline.predict_proba(model_input)[:, 1]
+        return pd.DataFrame({
+            TARGET_VARIABLE: (churn_proba >= self.threshold).astype(int),
+            "CHURN_PROBABILITY": churn_proba
+        })
+
+
+def _load_pyfunc(data_path: str) -> ChurnPyfuncModel:
+    """
+    Entry point used by 'mlflow.pyfunc.load_model()' / 'mlflow models serve' (loader_module).
+    """
+    return ChurnPyfuncModel(joblib.load(data_path))
+
+
+def save_pyfunc_model(pipeline, model_path: Path, model_dir: Path, input_example: pd.DataFrame) -> Path:
+    """
+    Writes an MLflow model directory (MLmodel, requirements, signature, input example) around the
+    already dumped joblib file - the file is copied, the pipeline is not serialized a second time.
+
+    return: model_dir (ready for 'log_artifacts', 'mlflow.pyfunc.load_model' or 'mlflow models serve')
+    """
+    model_dir = Path(model_dir)
+    if model_dir.exists():
+        shutil.rmtree(model_dir)  # save_model refuses to overwrite
+
+    signature = infer_signature(input_example, ChurnPyfuncModel(pipeline).predict(input_example))
+    mlflow.pyfunc.save_model(
+        path=str(model_dir),
+        loader_module="src.mlflow_model",
+        data_path=str(model_path),
+        code_paths=[str(PROJECT_ROOT / "src")],
+        signature=signature,
+        input_example=input_example,
+        # Explicit requirements: skips MLflow's inference, which would load the model in a subprocess
+        pip_requirements=[f"{package}=={version(package)}" for package in _MODEL_REQUIREMENTS]
+    )
+    return model_dir
@@ -0,0 +1,235 @@
+# src/monitoring.py
+
+import bisect
+import datetime
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    NUMERICAL_FEATURES,
+    CATEGORICAL_FEATURES,
+    DRIFT_N_BINS,
+    DRIFT_MAX_CATEGORIES,
+    DRIFT_MIN_SAMPLES,
+    DRIFT_REPORT_INTERVAL,
+    DRIFT_PSI_WARNING,
+    DRIFT_PSI_ALERT
+)
+from src.export import CategoryIndex
+
+# Empty bins are floored at this share so PSI stays finite
+_PSI_EPSILON = 1e-4
+
+
+def build_reference_profile(X: pd.DataFrame, churn_proba: np.ndarray, threshold: float,
+                            n_bins: int = DRIFT_N_BINS, max_categories: int = DRIFT_MAX_CATEGORIES) -> dict:
+    """
+    v2.0 - Reference statistics of held-out data, stored with the model ('reference_profile_').
+
+    - Numerical features: quantile bin edges and the share of rows per bin
+    - Categorical features: the most frequent categories and their shares (+ one 'other' share)
+    - Prediction: share of customers predicted to churn at the decision threshold
+
+    'churn_proba' must be the model's probabilities for the same rows as 'X', so that all
+    statistics (and 'n_samples') describe one population. Use rows the model was not fitted on
+    (like the live traffic it is compared with): in-sample probabilities are overconfident.
+
+    return: JSON-serializable dict (read by 'DriftMonitor')
+    """
+    if len(churn_proba) != len(X):
+        raise ValueError(f"'churn_proba' has {len(churn_proba)} rows but 'X' has {len(X)}; "
+                         "the reference profile must describe the same rows.")
+
+    numeric = {}
+    for feature in NUMERICAL_FEATURES:
+        values = X[feature].dropna().to_numpy(dtype=np.float64)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        numeric[feature] = {"edges": edges.tolist(), "proportions": (counts / counts.sum()).tolist()}
+
+    categorical = {}
+    for feature in CATEGORICAL_FEATURES:
+        shares = X[feature].value_counts(normalize=True)
+        top = shares.head(max_categories)
+        categorical[feature] = {
+            "categories": top.index.tolist(),
+            "proportions": top.tolist() + [float(1.0 - top.sum())]
+        }
+
+    return {
+        "n_samples": len(X),
+        "numeric": numeric,
+        "categorical": categorical,
+        "prediction": {"churn_rate": float(np.mean(np.asarray(churn_proba) >= threshold)), "threshold": threshold}
+    }
+
+
+def population_stability_index(expected, actual) -> float:
+    """
+    PSI = sum((actual - expected) * ln(actual / expected)) over the bins of two distributions.
+    """
+    expected = np.clip(np.asarray(expected, dtype=np.float64), _PSI_EPSILON, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), _PSI_EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def binned_ks(expected, actual) -> float:
+    """
+    Kolmogorov-Smirnov statistic on binned data: the largest gap between the two cumulative distributions
+    at the bin edges (a lower bound of the exact KS statistic).
+    """
+    return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+
+
+def _psi_status(psi: float) -> str:
+    if psi >= DRIFT_PSI_ALERT:
+        return "alert"
+    if psi >= DRIFT_PSI_WARNING:
+        return "warning"
+    return "stable"
+
+
+class DriftMonitor:
+    """
+    Constant-memory streaming summary of the live inputs and predictions of the API.
+
+    Live rows are counted into the fixed reference bins (numerical features), the tracked categories
+    (categorical features) and a churn counter; memory does not grow with traffic and an update costs
+    one binary search per value. 'report()' compares the counts with the reference profile (PSI/KS)
+    and reuses the result for 'report_interval' seconds.
+    """
+
+    def __init__(self, profile: dict, min_samples: int = DRIFT_MIN_SAMPLES,
+                 report_interval: float = DRIFT_REPORT_INTERVAL):
+        self.profile = profile
+        self.min_samples = min_samples
+        self.report_interval = report_interval
+
+        self._edges = {feature: np.asarray(spec["edges"], dtype=np.float64)
+                       for feature, spec in profile["numeric"].items()}
+        self._edge_lists = {feature: edges.tolist() for feature, edges in self._edges.items()}
+        self._indexes = {feature: CategoryIndex(spec["categories"])
+                         for feature, spec in profile["categorical"].items()}
+
+        self._lock = threading.Lock()
+        self._numeric_counts = {feature: np.zeros(len(edges) + 1, dtype=np.int64)
+                                for feature, edges in self._edges.items()}
+        self._category_counts = {feature: np.zeros(len(index) + 1, dtype=np.int64)
+                                 for feature, index in self._indexes.items()}
+        self.n_observed = 0
+        self.n_churn = 0
+
+        self._report = None
+        self._report_time = -np.inf
+
+    def update(self, columns, predictions):
+        """
+        Adds a request (one row) or a batch: 'columns' maps feature -> values, 'predictions' are the 0/1 decisions.
+        """
+        if len(predictions) == 1:
+            self._update_one(columns, predictions[0])
+            return
+
+        numeric_counts = {
+            feature: np.bincount(np.searchsorted(edges, np.asarray(columns[feature], dtype=np.float64), side="right"),
+                                 minlength=len(edges) + 1)
+            for feature, edges in self._edges.items()
+        }
+        category_counts = {}
+        for feature, index in self._indexes.items():
+            positions = index.lookup(columns[feature])
+            positions[positions < 0] = len(index)  # unknown / untracked -> 'other'
+            category_counts[feature] = np.bincount(positions, minlength=len(index) + 1)
+        n_rows = len(predictions)
+        n_churn = int(np.count_nonzero(predictions))
+
+        with self._lock:
+            for feature, counts in numeric_counts.items():
+                self._numeric_counts[feature] += counts
+            for feature, counts in category_counts.items():
+                self._category_counts[feature] += counts
+            self.n_observed += n_rows
+            self.n_churn += n_churn
+
+    def _update_one(self, columns, prediction):
+        # Single '/predict' request: plain bisect + dict lookups, no temporary arrays
+        numeric_bins = [(feature, bisect.bisect_right(edges, float(columns[feature][0])))
+                        for feature, edges in self._edge_lists.items()]
+        category_positions = []
+        for feature, index in self._indexes.items():
+            position = index.position(columns[feature][0])
+            category_positions.append((feature, position if position >= 0 else len(index)))
+
+        with self._lock:
+            for feature, position in numeric_bins:
+                self._numeric_counts[feature][position] += 1
+            for feature, position in category_positions:
+                self._category_counts[feature][position] += 1
+            self.n_observed += 1
+            self.n_churn += int(prediction != 0)
+
+    def reset(self):
+        with self._lock:
+            for counts in list(self._numeric_counts.values()) + list(self._category_counts.values()):
+                counts[:] = 0
+            self.n_observed = 0
+            self.n_churn = 0
+            self._report = None
+            self._report_time = -np.inf
+
+    def report(self, refresh: bool = False) -> dict:
+        """
+        return: PSI (+ binned KS for numerical features) per feature, the live vs reference churn rate
+                and an overall status ('insufficient_data', 'stable', 'warning' or 'alert')
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not refresh and self._report is not None and now - self._report_time < self.report_interval:
+                return self._report
+            numeric_counts = {feature: counts.copy() for feature, counts in self._numeric_counts.items()}
+            category_counts = {feature: counts.copy() for feature, counts in self._category_counts.items()}
+            n_observed, n_churn = self.n_observed, self.n_churn
+
+        report = {
+            "computed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "n_observed": n_observed,
+            "n_reference": self.profile["n_samples"],
+            "features": {},
+            "prediction": {"reference_churn_rate": self.profile["prediction"]["churn_rate"],
+                           "live_churn_rate": None, "psi": None}
+        }
+        if n_observed == 0:
+            report["status"] = "insufficient_data"
+            return self._store(report, now)
+
+        for feature, counts in numeric_counts.items():
+            expected = self.profile["numeric"][feature]["proportions"]
+            actual = counts / n_observed
+            psi = population_stability_index(expected, actual)
+            report["features"][feature] = {"psi": psi, "ks": binned_ks(expected, actual), "status": _psi_status(psi)}
+        for feature, counts in category_counts.items():
+            expected = self.profile["categorical"][feature]["proportions"]
+            actual = counts / n_observed
+            psi = population_stability_index(expected, actual)
+            report["features"][feature] = {"psi": psi, "other_share": float(actual[-1]), "status": _psi_status(psi)}
+
+        reference_rate = self.profile["prediction"]["churn_rate"]
+        live_rate = n_churn / n_observed
+        prediction_psi = population_stability_index([1 - reference_rate, reference_rate], [1 - live_rate, live_rate])
+        report["prediction"].update({"live_churn_rate": live_rate, "psi": prediction_psi,
+                                     "status": _psi_status(prediction_psi)})
+
+        if n_observed < self.min_samples:
+            report["status"] = "insufficient_data"
+        else:
+            statuses = [scores["status"] for scores in report["features"].values()] + [report["prediction"]["status"]]
+            report["status"] = next(status for status in ("alert", "warning", "stable") if status in statuses)
+        return self._store(report, now)
+
+    def _store(self, report: dict, now: float) -> dict:
+        with self._lock:
+            self._report, self._report_time = report, now
+        return report
@@ -1,5 +1,6 @@
 # src/pipeline.py
 
+from sklearn.base import clone
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
@@ -15,10 +16,13 @@ from src.config import (
 )
 
 
-def create_pipeline() -> Pipeline:
+def create_pipeline(early_stopping_rounds: int = None) -> Pipeline:
     """
     Creates the scikit-learn pipeline, which includes all data processing and modeling steps, for customer data created with 'feature_engineering'.
 
+    early_stopping_rounds: If set, XGBoost stops once the eval-set logloss has not improved for that many rounds
+                           (the pipeline must then be trained with 'fit_with_eval_set').
+
     return: Training-ready scikit-learn Pipeline object
     """
 
@@ -53,8 +57,24 @@ def create_pipeline() -> Pipeline:
     # === 4. Main Pipeline (Big Picture) ===
     model_pipeline = Pipeline(steps=[
         ('preprocessor', preprocessor),
-        ('classifier', XGBClassifier(**XGB_PARAMS))
+        ('classifier', XGBClassifier(**XGB_PARAMS, early_stopping_rounds=early_stopping_rounds))
     ])
 
     print("Successfully created scikit-learn pipeline (for Churn Model).")
-    return model_pipeline
\ No newline at end of file
+    return model_pipeline
+
+
+def fit_with_eval_set(pipeline: Pipeline, X_train, y_train, X_val, y_val) -> Pipeline:
+    """
+    Trains the pipeline while XGBoost tracks the logloss on a validation split.
+
+    XGBoost sees the *transformed* features, so the eval set is passed through a copy of the
+    preprocessor fitted on the same training data (identical to the one inside the pipeline).
+
+    return: The fitted pipeline ('classifier.evals_result()' holds the per-iteration curve)
+    """
+    preprocessor = clone(pipeline.named_steps['preprocessor']).fit(X_train, y_train)
+    eval_set = [(preprocessor.transform(X_val), y_val)]
+
+    pipeline.fit(X_train, y_train, classifier__eval_set=eval_set, classifier__verbose=False)
+    return pipeline
\ No newline at end of file
@@ -0,0 +1,129 @@
+# src/sketches.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from src.config import HLL_PRECISION
+
+# Bits of the 64-bit hash scanned for the leading zero run (after the register index bits)
+_RANK_BITS = 32
+
+
+def _hash_invoices(invoices) -> np.ndarray:
+    """
+    64-bit hashes of the invoice numbers. Values are hashed as strings, so 489434 (int, as Excel
+    sometimes reads it) and '489434' land in the same register in every chunk / partition / day.
+    Each distinct value is converted and hashed once (invoices repeat on every line item).
+    """
+    codes, uniques = pd.factorize(np.asarray(invoices, dtype=object))
+    unique_hashes = pd.util.hash_array(np.asarray(uniques, dtype=object).astype(str).astype(object))
+    return unique_hashes[codes]
+
+
+class InvoiceSketch:
+    """
+    Per-customer HyperLogLog sketches of distinct invoices (approximate 'nunique()' of Invoice).
+
+    Every customer owns 2^precision one-byte registers in a single uint8 matrix
+    (customer_ids[i] -> registers[i]). Sketches of different chunks, partitions or days
+    are merged with an element-wise max, which gives exactly the sketch of the combined data.
+    Relative error is about 1.04 / sqrt(2^precision); small counts are almost exact (linear counting).
+    """
+
+    def __init__(self, customer_ids: np.ndarray, registers: np.ndarray, precision: int = HLL_PRECISION):
+        self.customer_ids = np.asarray(customer_ids)
+        self.registers = np.asarray(registers, dtype=np.uint8)
+        self.precision = precision
+
+    @property
+    def n_registers(self) -> int:
+        return 1 << self.precision
+
+    @property
+    def nbytes(self) -> int:
+        return self.customer_ids.nbytes + self.registers.nbytes
+
+    @classmethod
+    def from_transactions(cls, customer_ids, invoices, precision: int = HLL_PRECISION) -> "InvoiceSketch":
+        """
+        Builds the sketches of one batch of transaction rows (vectorized, no per-customer sets).
+        """
+        unique_ids, customer_rows = np.unique(np.asarray(customer_ids), return_inverse=True)
+        hashes = _hash_invoices(invoices)
+
+        # First 'precision' bits pick the register, the next bits give the rank (position of the first 1-bit)
+        register_index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+        rank_window = ((hashes << np.uint64(precision)) >> np.uint64(64 - _RANK_BITS)).astype(np.float64)
+        _, bit_length = np.frexp(rank_window)  # exact for integers < 2^53; 0 -> bit_length 0
+        ranks = (_RANK_BITS + 1 - bit_length).astype(np.uint8)
+
+        n_registers = 1 << precision
+        registers = np.zeros(len(unique_ids) * n_registers, dtype=np.uint8)
+        np.maximum.at(registers, customer_rows * n_registers + register_index, ranks)
+        return cls(unique_ids, registers.reshape(len(unique_ids), n_registers), precision)
+
+    def merge(self, other: "InvoiceSketch") -> "InvoiceSketch":
+        """
+        Union of two sketches (e.g. two chunks or two days). Customers may appear in either or both.
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge sketches with precision {self.precision} and {other.precision}.")
+
+        customer_ids = np.union1d(self.customer_ids, other.customer_ids)
+        registers = np.zeros((len(customer_ids), self.n_registers), dtype=np.uint8)
+        registers[np.searchsorted(customer_ids, self.customer_ids)] = self.registers
+        other_rows = np.searchsorted(customer_ids, other.customer_ids)
+        registers[other_rows] = np.maximum(registers[other_rows], other.registers)
+        return InvoiceSketch(customer_ids, registers, self.precision)
+
+    def estimate(self) -> pd.Series:
+        """
+        return: Estimated number of distinct invoices per customer (Series indexed by customer id)
+        """
+        m = self.n_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        harmonic = np.sum(np.exp2(-self.registers.astype(np.float64)), axis=1)
+        raw_estimate = alpha * m * m / harmonic
+
+        # Small-range correction: linear counting while empty registers remain
+        n_empty = np.count_nonzero(self.registers == 0, axis=1)
+        with np.errstate(divide="ignore"):
+            linear_count = m * np.log(m / n_empty)
+        estimate = np.where((raw_estimate <= 2.5 * m) & (n_empty > 0), linear_count, raw_estimate)
+        return pd.Series(estimate, index=self.customer_ids)
+
+    def save(self, path: Path):
+        """
+        Stores the sketch as a compressed .npz file (e.g. one per day, merged later).
+        """
+        np.savez_compressed(path, customer_ids=self.customer_ids, registers=self.registers,
+                            precision=self.precision)
+
+    @classmethod
+    def load(cls, path: Path) -> "InvoiceSketch":
+        data = np.load(path, allow_pickle=False)
+        return cls(data["customer_ids"], data["registers"], int(data["precision"]))
+
+
+def sketch_invoices(df: pd.DataFrame, customer_col: str, invoice_col: str, precision: int = HLL_PRECISION,
+                    chunk_size: int = None, n_jobs: int = 1) -> InvoiceSketch:
+    """
+    Builds the InvoiceSketch of a transaction table, optionally chunk by chunk (in parallel with joblib)
+    and merged at the end - the result does not depend on how the rows were split.
+    """
+    if not chunk_size or chunk_size >= len(df):
+        return InvoiceSketch.from_transactions(df[customer_col].to_numpy(), df[invoice_col], precision)
+
+    chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+    partial_sketches = Parallel(n_jobs=n_jobs)(
+        delayed(InvoiceSketch.from_transactions)(chunk[customer_col].to_numpy(), chunk[invoice_col], precision)
+        for chunk in chunks
+    )
+
+    sketch = partial_sketches[0]
+    for partial in partial_sketches[1:]:
+        sketch = sketch.merge(partial)
+    return sketch
@@ -0,0 +1,172 @@
+# src/tracking.py
+
+import atexit
+import queue
+import threading
+import time
+
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
+
+from src.config import (
+    MLFLOW_FLUSH_INTERVAL,
+    MLFLOW_MAX_BATCH_SIZE
+)
+
+# Limits of a single 'log_batch' call in the MLflow REST API
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_METRICS_PER_BATCH = 1000
+
+_STOP = object()
+
+
+class AsyncMlflowLogger:
+    """
+    Buffers MLflow params/metrics and writes them with 'log_batch' from a background thread,
+    so training never waits for the tracking backend.
+
+    - Params and metrics are collected and flushed in batches (every 'flush_interval' seconds
+      or as soon as 'max_batch_size' entries are waiting).
+    - Artifacts (files, texts) are uploaded by the same thread, after the pending batch,
+      so the order of the calls is preserved. Artifacts that are slow to build (e.g. an MLflow
+      model directory) can be built there too ('log_built_artifacts').
+    - Everything is flushed on 'close()' (also called by the 'with' block and at process exit).
+
+    Usage:
+        with mlflow.start_run() as run, AsyncMlflowLogger(run.info.run_id) as tracker:
+            tracker.log_param("test_size", 0.2)
+    """
+
+    def __init__(self, run_id: str, client: MlflowClient = None,
+                 flush_interval: float = MLFLOW_FLUSH_INTERVAL, max_batch_size: int = MLFLOW_MAX_BATCH_SIZE):
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.errors = []
+
+        self._queue = queue.Queue()
+        self._params = {}  # key -> Param (a key may only appear once per batch)
+        self._metrics = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="mlflow-logger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- Public API (mirrors the 'mlflow.log_*' functions, returns immediately) ---
+
+    def log_param(self, key: str, value):
+        self._queue.put(("param", Param(key, str(value))))
+
+    def log_params(self, params: dict):
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def log_metric(self, key: str, value: float, step: int = 0):
+        timestamp = int(time.time() * 1000)
+        self._queue.put(("metric", Metric(key, float(value), timestamp, step)))
+
+    def log_metrics(self, metrics: dict, step: int = 0):
+        for key, value in metrics.items():
+            self.log_metric(key, value, step=step)
+
+    def log_text(self, text: str, artifact_file: str):
+        self._queue.put(("call", (self.client.log_text, (self.run_id, text, artifact_file))))
+
+    def log_artifact(self, local_path, artifact_path: str = None):
+        """
+        Uploads an existing file (e.g. the joblib model that was already dumped) - no re-serialization.
+        """
+        self._queue.put(("call", (self.client.log_artifact, (self.run_id, str(local_path), artifact_path))))
+
+    def log_artifacts(self, local_dir, artifact_path: str = None):
+        self._queue.put(("call", (self.client.log_artifacts, (self.run_id, str(local_dir), artifact_path))))
+
+    def log_built_artifacts(self, build, artifact_path: str = None):
+        """
+        Calls 'build()' on the background thread and uploads the directory it returns,
+        so building the artifact (e.g. 'save_pyfunc_model') does not block training either.
+        """
+        self._queue.put(("call", (self._build_and_log_artifacts, (build, artifact_path))))
+
+    def flush(self):
+        """
+        Blocks until everything logged so far has been written to the backend (no-op once closed:
+        'close()' has already flushed everything and the background thread is gone).
+        """
+        if self._closed:
+            return
+        self._queue.put(("flush", None))
+        self._queue.join()
+
+    def close(self):
+        """
+        Flushes the remaining entries and stops the background thread (idempotent).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None))
+        self._thread.join()
+        atexit.unregister(self.close)
+        for error in self.errors:
+            print(f"WARNING: MLflow logging failed: {error}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --- Background Thread ---
+
+    def _build_and_log_artifacts(self, build, artifact_path: str):
+        self.client.log_artifacts(self.run_id, str(build()), artifact_path)
+
+    def _write_batch(self):
+        try:
+            pending_params, self._params = list(self._params.values()), {}
+            while pending_params or self._metrics:
+                params, pending_params = pending_params[:_MAX_PARAMS_PER_BATCH], pending_params[_MAX_PARAMS_PER_BATCH:]
+                n_metrics = _MAX_METRICS_PER_BATCH - len(params)
+                metrics, self._metrics = self._metrics[:n_metrics], self._metrics[n_metrics:]
+                self.client.log_batch(self.run_id, metrics=metrics, params=params)
+        except Exception as e:
+            self.errors.append(e)
+            self._metrics = []
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0.0)
+            try:
+                kind, item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write_batch()
+                last_flush = time.monotonic()
+                continue
+
+            try:
+                if kind == "param":
+                    self._params[item.key] = item
+                elif kind == "metric":
+                    self._metrics.append(item)
+                else:
+                    # Artifacts, explicit flushes and the stop signal: write the pending batch first
+                    self._write_batch()
+                    last_flush = time.monotonic()
+                    if kind == "call":
+                        function, args = item
+                        try:
+                            function(*args)
+                        except Exception as e:
+                            self.errors.append(e)
+
+                if len(self._params) + len(self._metrics) >= self.max_batch_size:
+                    self._write_batch()
+                    last_flush = time.monotonic()
+            finally:
+                self._queue.task_done()
+
+            if kind is _STOP:
+                return
@@ -4,10 +4,16 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import f1_score
 from joblib import dump
+import argparse
+import json
+import os
+import shutil
 import sys
+import tempfile
 import datetime
+import time
+from pathlib import Path
 import mlflow
-import mlflow.sklearn
 import warnings
 from warnings import filterwarnings
 filterwarnings('ignore')
@@ -15,44 +21,83 @@ filterwarnings('ignore')
 from src.config import (
     MODEL_OUTPUT_PATH,
     ENGINEERED_DATA_PATH,
+    EXPORT_DIR,
+    MLFLOW_MODEL_DIR,
     TEST_SIZE,
+    VALIDATION_SIZE,
     RANDOM_STATE,
     TARGET_VARIABLE,
     MLFLOW_EXPERIMENT_NAME,
     CHURN_THRESHOLD_DAYS,
+    DECISION_THRESHOLD,
+    EXPORT_FIDELITY_TOLERANCE,
+    EARLY_STOPPING_ROUNDS,
+    CV_FOLDS,
+    CV_CONFIDENCE,
     XGB_PARAMS
 )
 from src.feature_engineering import create_customer_features, save_customer_features
-from src.pipeline import create_pipeline
+from src.pipeline import create_pipeline, fit_with_eval_set
+from src.tracking import AsyncMlflowLogger
+from src.mlflow_model import save_pyfunc_model
+from src.monitoring import build_reference_profile
+from src.evaluation import sweep_thresholds, choose_threshold, cross_validate_parallel
+from src.export import (
+    NativeChurnPredictor,
+    export_inference_artifact,
+    find_pruned_tree_count,
+    pruned_churn_proba,
+    compare_with_pipeline
+)
 
 
-def run_training():
+def run_training(prune_trees: bool = False, early_stopping: bool = False,
+                 cv_folds: int = None, cv_compare_serial: bool = False):
     """
     v2.0 - Manages the main training and feature engineering flow.
 
     1. Runs the feature engineering (and saves 'customer_features.csv').
     2. Reads the processed data.
     3. Splits the data into train/test.
-    4. Trains the pipeline (model).
+    4. Trains the pipeline (model) and tunes its decision threshold on the test probabilities.
+       The reference profile for drift monitoring (built on the held-out test rows) is stored with the model.
     5. Records the entire process in MLFlow.
+    6. Exports an inference-optimized artifact (native booster + NumPy preprocessing).
+
+    prune_trees: Hold out a validation split and keep only the trees found by early stopping on it.
+    early_stopping: Hold out a validation split and stop training once its logloss stops improving
+                    (already prunes the export to the best iteration, so it excludes 'prune_trees').
+    cv_folds: Additionally evaluate the model with stratified k-fold CV (folds fitted in parallel).
+    cv_compare_serial: Re-run the CV serially (XGBoost multi-threaded) and log both wall times.
     """
     print("===== Starting the Training Process (v2.0 - with MLFlow) =====")
 
+    if prune_trees and early_stopping:
+        print("ERROR: 'early_stopping' and 'prune_trees' cannot be combined "
+              "(early stopping already keeps only the trees up to its best iteration).")
+        sys.exit(1)
+
     # === Start the MLFlow Experiment ===
     mlflow.set_experiment(MLFLOW_EXPERIMENT_NAME)
 
     current_time = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     run_name = f"run_churn_{current_time}"
 
-    with mlflow.start_run(run_name=run_name):
+    # Params/metrics/artifacts are buffered and written in batches by a background thread;
+    # leaving the 'with' block flushes everything before the run is closed.
+    with mlflow.start_run(run_name=run_name) as run, AsyncMlflowLogger(run.info.run_id) as tracker:
 
         # --- MLFlow Registration Step 1: Parameters ---
         print("Saving parameters to MLFlow...")
-        mlflow.log_param("test_size", TEST_SIZE)
-        mlflow.log_param("random_state", RANDOM_STATE)
-        mlflow.log_param("churn_threshold_days", CHURN_THRESHOLD_DAYS)
+        tracker.log_param("test_size", TEST_SIZE)
+        tracker.log_param("random_state", RANDOM_STATE)
+        tracker.log_param("churn_threshold_days", CHURN_THRESHOLD_DAYS)
+        tracker.log_param("prune_trees", prune_trees)
+        tracker.log_param("early_stopping", early_stopping)
+        if early_stopping:
+            tracker.log_param("early_stopping_rounds", EARLY_STOPPING_ROUNDS)
         print("Saving XGBoost hyperparameters to MLFlow...")
-        mlflow.log_params(XGB_PARAMS)
+        tracker.log_params(XGB_PARAMS)
 
         # --- Steps 1 & 2: Feature Engineering (Heart of the Project) ---
         print("Feature engineering (RFM + Churn) begins...")
@@ -82,39 +127,182 @@ def run_training():
         print(f"Data was split into training and test sets. (Stratified)")
         print(f"Leakage prevented: 'Recency' column was manually omitted.")
 
+        # --- Step 4b (optional): Parallel k-Fold Cross-Validation ---
+        if cv_folds:
+            print(f"{cv_folds}-fold cross-validation begins (parallel folds, shared memmap data)...")
+            cv_result = cross_validate_parallel(X, y, n_splits=cv_folds, compare_serial=cv_compare_serial)
+            cv_summary = cv_result["summary"]
+            for metric in ["f1", "logloss", "auc"]:
+                print(f"CV {metric}: {cv_summary[f'{metric}_mean']:.4f} "
+                      f"({CV_CONFIDENCE:.0%} CI {cv_summary[f'{metric}_ci_low']:.4f} - {cv_summary[f'{metric}_ci_high']:.4f})")
+            print(f"CV wall time: {cv_result['wall_time_s']:.2f} s ({cv_result['setup']})")
+
+            tracker.log_param("cv_folds", cv_folds)
+            tracker.log_param("cv_setup", cv_result["setup"])
+            tracker.log_metrics({f"cv_{name}": value for name, value in cv_summary.items()})
+            tracker.log_metric("cv_wall_time_s", cv_result["wall_time_s"])
+            if cv_compare_serial:
+                print(f"CV wall time: {cv_result['serial_wall_time_s']:.2f} s ({cv_result['serial_setup']}), "
+                      f"speedup x{cv_result['speedup']:.2f}")
+                tracker.log_param("cv_serial_setup", cv_result["serial_setup"])
+                tracker.log_metric("cv_serial_wall_time_s", cv_result["serial_wall_time_s"])
+                tracker.log_metric("cv_speedup", cv_result["speedup"])
+
+        # Validation split for pruning / early stopping (carved out of the training set, never the test set)
+        X_fit, y_fit = X_train, y_train
+        if prune_trees or early_stopping:
+            X_fit, X_val, y_fit, y_val = train_test_split(
+                X_train, y_train,
+                test_size=VALIDATION_SIZE,
+                random_state=RANDOM_STATE,
+                stratify=y_train
+            )
+            print(f"Validation split held out: {len(X_val)} customers.")
+
         # --- Step 5: Create the Pipeline ---
-        pipeline = create_pipeline()
+        pipeline = create_pipeline(early_stopping_rounds=EARLY_STOPPING_ROUNDS if early_stopping else None)
 
         # --- Step 6: Train the Pipeline ---
         print("Pipeline training (fit) begins...")
-        pipeline.fit(X_train, y_train)
-        print("Pipeline training has been completed.")
+        fit_start = time.perf_counter()
+        if early_stopping or prune_trees:
+            # Pruning reads the per-round validation logloss XGBoost records here (all rounds are trained)
+            fit_with_eval_set(pipeline, X_fit, y_fit, X_val, y_val)
+        else:
+            pipeline.fit(X_fit, y_fit)
+        fit_time = time.perf_counter() - fit_start
+        print(f"Pipeline training has been completed in {fit_time:.2f} s.")
+        tracker.log_metric("fit_time_s", fit_time)
+
+        if early_stopping:
+            classifier = pipeline.named_steps['classifier']
+            val_curve = classifier.evals_result()['validation_0']['logloss']
+            print(f"Early stopping: best iteration {classifier.best_iteration} "
+                  f"({len(val_curve)} of {XGB_PARAMS['n_estimators']} rounds trained).")
+            tracker.log_metric("best_iteration", classifier.best_iteration)
+            tracker.log_metric("best_val_logloss", classifier.best_score)
+            tracker.log_metric("n_rounds_trained", len(val_curve))
+            for step, val_logloss in enumerate(val_curve):
+                tracker.log_metric("val_logloss", val_logloss, step=step)
 
         # --- Step 7: Calculate Metrics (F1-Score instead of Accuracy) ---
-        preds = pipeline.predict(X_test)
+        # One inference pass: the probabilities serve both the default cut and the threshold sweep
+        churn_proba = pipeline.predict_proba(X_test)[:, 1]
+        preds = (churn_proba >= DECISION_THRESHOLD).astype(int)
         f1 = f1_score(y_test, preds)
         print(f"F1 Score of the model on the test data: {f1:.4f}")
 
+        # --- Step 7b: Tune the Decision Threshold (vectorized sweep) ---
+        sweep = sweep_thresholds(y_test, churn_proba)
+        best_threshold = choose_threshold(sweep)
+        best_f1 = float(sweep["f1"].max())
+        print(f"Best decision threshold: {best_threshold:.2f} (F1: {best_f1:.4f})")
+
+        # The threshold travels with the model, so the API needs no extra config
+        pipeline.decision_threshold_ = best_threshold
+
+        # --- Step 7c: Reference Profile for Drift Monitoring (compared with live traffic by the API) ---
+        # Built on the held-out test rows: live traffic is out-of-sample too, while in-sample probabilities
+        # of the training rows are overconfident and would bias the reference churn rate
+        pipeline.reference_profile_ = build_reference_profile(X_test, churn_proba, best_threshold)
+
         # --- MLFlow Recording Step 2: Metrics ---
         print("Saving metrics to MLFlow...")
-        mlflow.log_metric("f1_score", f1)
+        tracker.log_metric("f1_score", f1)
+        tracker.log_metric("decision_threshold", best_threshold)
+        tracker.log_metric("f1_score_tuned", best_f1)
+        for step, row in enumerate(sweep.itertuples(index=False)):
+            tracker.log_metrics({"sweep_precision": row.precision,
+                                "sweep_recall": row.recall,
+                                "sweep_f1": row.f1}, step=step)
+        tracker.log_text(sweep.to_csv(index=False), "threshold_sweep.csv")
+        tracker.log_text(json.dumps(pipeline.reference_profile_, indent=2), "reference_profile.json")
+
+        # --- Step 8: Export Inference-Optimized Artifact (checked before anything is replaced) ---
+        n_trees, export_threshold = None, None
+        if early_stopping:
+            # Trees trained after the best iteration are dropped from the served artifact
+            n_trees = pipeline.named_steps['classifier'].best_iteration + 1
+        elif prune_trees:
+            n_trees, val_curve = find_pruned_tree_count(pipeline)
+            print(f"Pruning: keeping {n_trees} of {XGB_PARAMS['n_estimators']} trees (early stopping on validation logloss).")
+            for step, val_logloss in enumerate(val_curve, start=1):
+                tracker.log_metric("prune_val_logloss", val_logloss, step=step)
+
+            # The pruned booster outputs different probabilities: tune its own threshold on the same test split
+            pruned_sweep = sweep_thresholds(y_test, pruned_churn_proba(pipeline, X_test, n_trees))
+            export_threshold = choose_threshold(pruned_sweep)
+            print(f"Pruned model decision threshold: {export_threshold:.2f} "
+                  f"(F1: {pruned_sweep['f1'].max():.4f})")
+            tracker.log_metric("export_decision_threshold", export_threshold)
+            tracker.log_metric("export_f1_score_tuned", float(pruned_sweep["f1"].max()))
 
-        # --- Step 8: Save Model (Local + MLFlow) ---
+        # Exported to a staging directory next to 'models/native': the served model and the previous
+        # export are only replaced once the fidelity check has passed
+        EXPORT_DIR.parent.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=f"{EXPORT_DIR.name}_", dir=EXPORT_DIR.parent))
+        export_inference_artifact(pipeline, staging_dir, n_trees=n_trees, threshold=export_threshold)
+
+        export_report = compare_with_pipeline(pipeline, NativeChurnPredictor.load(staging_dir), X_test)
+        print(f"Export fidelity: max |dP| = {export_report['max_abs_proba_diff']:.2e}, "
+              f"decision agreement with full model = {export_report['decision_agreement']:.2%}")
+        print(f"Single-row latency: pipeline {export_report['pipeline_single_ms']:.3f} ms "
+              f"vs native {export_report['native_single_ms']:.3f} ms")
+        print(f"Batch throughput: pipeline {export_report['pipeline_batch_rows_per_s']:,.0f} rows/s "
+              f"vs native {export_report['native_batch_rows_per_s']:,.0f} rows/s")
+        tracker.log_metrics({f"export_{name}": value for name, value in export_report.items()})
+
+        if export_report["max_abs_proba_diff"] > EXPORT_FIDELITY_TOLERANCE:
+            shutil.rmtree(staging_dir)
+            print(f"ERROR: Exported artifact deviates from the pipeline by more than {EXPORT_FIDELITY_TOLERANCE}.")
+            print(f"The served model ({MODEL_OUTPUT_PATH}) and the previous export were left unchanged.")
+            sys.exit(1)
+
+        # --- Step 9: Save Model (Local + MLFlow) ---
 
         MODEL_OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        dump(pipeline, MODEL_OUTPUT_PATH)
+        if early_stopping:
+            # The trees (and best iteration) stay; the param would make a refit of the saved pipeline
+            # without an eval set fail
+            pipeline.named_steps['classifier'].set_params(early_stopping_rounds=None)
+        # Written next to the target and renamed: readers never see a half-written model file
+        tmp_model_path = MODEL_OUTPUT_PATH.with_name(MODEL_OUTPUT_PATH.name + ".tmp")
+        dump(pipeline, tmp_model_path)
+        os.replace(tmp_model_path, MODEL_OUTPUT_PATH)
         print(f"The trained model (pipeline) is saved to: {MODEL_OUTPUT_PATH}")
 
-        # MLFlow Registration
+        if EXPORT_DIR.exists():
+            shutil.rmtree(EXPORT_DIR)
+        staging_dir.rename(EXPORT_DIR)
+        print(f"Inference-optimized artifact exported to: {EXPORT_DIR}")
+
+        # MLFlow Registration: a pyfunc model directory around the joblib file written above
+        # (no second serialization; loadable with 'mlflow.pyfunc.load_model', registrable, servable).
+        # Building it (signature + input example validation, ~0.5 s) runs on the logger's thread.
         print("Saving model (artifact) to MLFlow...")
-        mlflow.sklearn.log_model(
-            sk_model=pipeline,
-            artifact_path="model_churn",
-            input_example=X_train.head()
+        input_example = X_train.head()
+        tracker.log_built_artifacts(
+            lambda: save_pyfunc_model(pipeline, MODEL_OUTPUT_PATH, MLFLOW_MODEL_DIR, input_example),
+            artifact_path="model_churn"
         )
+        tracker.log_artifacts(str(EXPORT_DIR), artifact_path="model_native")
 
         print("===== Training Process Completed (MLFlow) =====")
 
 
 if __name__ == "__main__":
-    run_training()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the churn model (v2.0 - with MLFlow).")
+    # Both hold out a validation split and prune the export; early stopping also stops the training itself
+    tree_count_mode = parser.add_mutually_exclusive_group()
+    tree_count_mode.add_argument("--prune-trees", action="store_true",
+                                 help="Prune the exported model to the tree count found by early stopping on a validation split.")
+    tree_count_mode.add_argument("--early-stopping", action="store_true",
+                                 help="Train with a validation eval set and stop once its logloss stops improving.")
+    parser.add_argument("--cv-folds", type=int, default=None,
+                        help=f"Also evaluate with stratified k-fold CV in parallel (e.g. {CV_FOLDS}).")
+    parser.add_argument("--cv-compare-serial", action="store_true",
+                        help="Re-run the CV serially (folds one at a time, XGBoost multi-threaded) and report both wall times.")
+    args = parser.parse_args()
+
+    run_training(prune_trees=args.prune_trees, early_stopping=args.early_stopping,
+                 cv_folds=args.cv_folds, cv_compare_serial=args.cv_compare_serial)
\ No newline at end of file
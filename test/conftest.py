@@ -0,0 +1,47 @@
+# test/conftest.py
+
+import joblib
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic import save_synthetic_model, make_customer_features
+from src.config import TARGET_VARIABLE
+
+
+@pytest.fixture(scope="session")
+def synthetic_model_path(tmp_path_factory):
+    """
+    pytest Fixture: A model fitted on synthetic customers (no raw data needed), saved once per session.
+    """
+    model_dir = tmp_path_factory.mktemp("models")
+    return save_synthetic_model(model_dir / "churn_model.joblib", n_customers=1000)
+
+
+@pytest.fixture(scope="session")
+def synthetic_pipeline(synthetic_model_path):
+    """
+    pytest Fixture: The fitted synthetic pipeline itself (loaded from the saved model).
+    """
+    return joblib.load(synthetic_model_path)
+
+
+@pytest.fixture(scope="session")
+def synthetic_holdout():
+    """
+    pytest Fixture: (X, y) of unseen synthetic customers (different seed than the training data).
+    """
+    features_df = make_customer_features(400, seed=7)
+    return features_df.drop(columns=[TARGET_VARIABLE, "Recency"]), features_df[TARGET_VARIABLE]
+
+
+@pytest.fixture
+def api_client(synthetic_model_path, monkeypatch):
+    """
+    pytest Fixture: In-process client for 'app.main:app' serving the synthetic model.
+    Entering the TestClient runs the 'startup' event (load_model).
+    """
+    monkeypatch.setenv("CHURN_MODEL_PATH", str(synthetic_model_path))
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,61 @@
+# test/test_api.py
+
+
+def test_predict_default_response_has_only_churn(api_client):
+    """
+    Test 1: Without 'include_probability', the response keeps the v3.0 format {"CHURN": 0|1}.
+    """
+
+    # Arrange
+    payload = {"Frequency": 5, "Monetary": 150.75, "Country": "United Kingdom"}
+
+    # Act
+    response = api_client.post("/predict", json=payload)
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"CHURN"}
+    assert data["CHURN"] in (0, 1)
+
+
+def test_predict_with_probability_applies_threshold(api_client):
+    """
+    Test 2: With 'include_probability=true', CHURN must be P(CHURN) >= THRESHOLD.
+    """
+
+    # Arrange
+    payload = {"Frequency": 1, "Monetary": 10.20, "Country": "France"}
+
+    # Act
+    response = api_client.post("/predict", params={"include_probability": True}, json=payload)
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert 0.0 <= data["CHURN_PROBABILITY"] <= 1.0
+    assert data["CHURN"] == int(data["CHURN_PROBABILITY"] >= data["THRESHOLD"])
+
+
+def test_predict_normalizes_country_and_reports_unknowns(api_client):
+    """
+    Test 3 (Country Index): ' united kingdom ' scores like 'United Kingdom',
+    and unknown countries show up in '/metrics'.
+    """
+
+    # Arrange
+    payload = {"Frequency": 5, "Monetary": 150.75, "Country": "United Kingdom"}
+    variant = {**payload, "Country": " united kingdom "}
+    unknown = {**payload, "Country": "Atlantis"}
+
+    # Act
+    exact = api_client.post("/predict", params={"include_probability": True}, json=payload).json()
+    normalized = api_client.post("/predict", params={"include_probability": True}, json=variant).json()
+    before = api_client.get("/metrics").json()["categories"]["Country"]["unknown"]
+    api_client.post("/predict", json=unknown)
+    after = api_client.get("/metrics").json()["categories"]["Country"]
+
+    # Assert
+    assert normalized["CHURN_PROBABILITY"] == exact["CHURN_PROBABILITY"]
+    assert after["unknown"] == before + 1
+    assert after["vocabulary_size"] > 0
@@ -0,0 +1,111 @@
+# test/test_columnar.py
+
+import numpy as np
+import pytest
+
+from app.columnar import parse_columnar, ColumnarValidationError, UnsupportedMediaTypeError
+
+
+def test_parse_columnar_json():
+    """
+    Test 1: A valid JSON body becomes typed column arrays.
+    """
+
+    # Arrange
+    body = b'{"Frequency": [1, 20], "Monetary": [10.2, 5000.5], "Country": ["France", "United Kingdom"]}'
+
+    # Act
+    columns = parse_columnar(body, "application/json")
+
+    # Assert
+    np.testing.assert_array_equal(columns["Frequency"], [1.0, 20.0])
+    np.testing.assert_array_equal(columns["Monetary"], [10.2, 5000.5])
+    assert columns["Country"].tolist() == ["France", "United Kingdom"]
+
+
+@pytest.mark.parametrize("body, bad_field", [
+    (b'{"Frequency": [1], "Monetary": [10.0]}', "Country"),                                   # missing column
+    (b'{"Frequency": ["x"], "Monetary": [10.0], "Country": ["France"]}', "Frequency"),        # wrong type
+    (b'{"Frequency": [1.5], "Monetary": [10.0], "Country": ["France"]}', "Frequency"),        # not a whole number
+    (b'{"Frequency": [1], "Monetary": [-3.0], "Country": ["France"]}', "Monetary"),           # out of range
+    (b'{"Frequency": [1], "Monetary": [10.0], "Country": [42]}', "Country"),                  # number, not string
+    (b'{"Frequency": [1, [2]], "Monetary": [1.0, 2.0], "Country": ["A", "B"]}', "Frequency"),  # ragged
+    (b'{"Frequency": [[1], [2, 3]], "Monetary": [1.0, 2.0], "Country": ["A", "B"]}', "Frequency"),  # nested
+])
+def test_parse_columnar_rejects_invalid_columns(body, bad_field):
+    """
+    Test 2: Type and range errors are reported per column in FastAPI's 422 format.
+    """
+
+    # Act
+    with pytest.raises(ColumnarValidationError) as error:
+        parse_columnar(body, "application/json")
+
+    # Assert
+    assert any(bad_field in detail["loc"] for detail in error.value.errors)
+
+
+def test_parse_columnar_rejects_unknown_media_type():
+    """
+    Test 3: Bodies in an unsupported format are refused (HTTP 415 in the API).
+    """
+
+    with pytest.raises(UnsupportedMediaTypeError):
+        parse_columnar(b"Frequency,Monetary,Country", "text/csv")
+
+
+def test_columnar_endpoint_matches_predict(api_client):
+    """
+    Test 4 (API): '/predict/columnar' must return the same decisions and probabilities as '/predict'.
+    """
+
+    # Arrange
+    customers = [
+        {"Frequency": 20, "Monetary": 5000.50, "Country": "United Kingdom"},
+        {"Frequency": 1, "Monetary": 10.20, "Country": "France"},
+        {"Frequency": 3, "Monetary": 120.00, "Country": "Atlantis"},  # unknown country
+    ]
+    columnar_body = {column: [customer[column] for customer in customers] for column in customers[0]}
+
+    # Act
+    response = api_client.post("/predict/columnar", params={"include_probability": True}, json=columnar_body)
+    single = [api_client.post("/predict", params={"include_probability": True}, json=customer).json()
+              for customer in customers]
+
+    # Assert
+    assert response.status_code == 200
+    data = response.json()
+    assert data["CHURN"] == [result["CHURN"] for result in single]
+    np.testing.assert_allclose(data["CHURN_PROBABILITY"], [result["CHURN_PROBABILITY"] for result in single],
+                               atol=1e-6)
+    assert api_client.post("/predict/columnar", json={"Frequency": [0]}).status_code == 422
+    ragged_body = {"Frequency": [1, [2]], "Monetary": [1.0, 2.0], "Country": ["France", "France"]}
+    assert api_client.post("/predict/columnar", json=ragged_body).status_code == 422
+
+
+@pytest.mark.parametrize("customer, valid", [
+    ({"Frequency": 1, "Monetary": 0.01, "Country": "France"}, True),           # lower bounds
+    ({"Frequency": 0, "Monetary": 10.0, "Country": "France"}, False),          # no invoices
+    ({"Frequency": 3, "Monetary": 0.0, "Country": "France"}, False),           # zero net spend
+    ({"Frequency": 3, "Monetary": -25.5, "Country": "France"}, False),         # returns / credit notes
+    ({"Frequency": 2.5, "Monetary": 10.0, "Country": "France"}, False),        # not a whole number
+    ({"Frequency": 3, "Monetary": 10.0, "Country": ""}, False),                # empty country
+    ({"Frequency": 3, "Monetary": 10.0, "Country": "   "}, False),             # blank country
+])
+def test_both_endpoints_agree_on_valid_customers(api_client, customer, valid):
+    """
+    Test 5 (API): '/predict' and '/predict/columnar' accept and reject the same customers
+    (NUMERICAL_INPUT_RULES in config.py, non-blank Country).
+    """
+
+    # Arrange
+    columnar_body = {column: [value] for column, value in customer.items()}
+
+    # Act
+    single = api_client.post("/predict", json=customer)
+    columnar = api_client.post("/predict/columnar", json=columnar_body)
+
+    # Assert
+    expected_status = 200 if valid else 422
+    assert single.status_code == expected_status
+    assert columnar.status_code == expected_status
@@ -0,0 +1,83 @@
+# test/test_evaluation.py
+
+import numpy as np
+import pytest
+from sklearn.metrics import f1_score, precision_score, recall_score
+
+from src.evaluation import sweep_thresholds, choose_threshold, summarize_folds, cross_validate_parallel
+
+
+def test_sweep_thresholds_matches_sklearn_metrics():
+    """
+    Test 1: The vectorized sweep must give the same precision/recall/F1 as scikit-learn at every threshold.
+    """
+
+    # Arrange
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, size=500)
+    churn_proba = np.clip(0.3 * y_true + rng.random(500) * 0.7, 0, 1)
+    thresholds = np.array([0.1, 0.25, 0.5, 0.75, 0.9])
+
+    # Act
+    sweep = sweep_thresholds(y_true, churn_proba, thresholds)
+
+    # Assert
+    for row in sweep.itertuples(index=False):
+        preds = (churn_proba >= row.threshold).astype(int)
+        assert row.f1 == pytest.approx(f1_score(y_true, preds))
+        assert row.precision == pytest.approx(precision_score(y_true, preds, zero_division=0))
+        assert row.recall == pytest.approx(recall_score(y_true, preds))
+
+
+def test_choose_threshold_returns_best_f1():
+    """
+    Test 2: A perfectly separable case must pick a threshold between the two classes.
+    """
+
+    # Arrange
+    y_true = np.array([0, 0, 0, 1, 1])
+    churn_proba = np.array([0.1, 0.2, 0.3, 0.6, 0.8])
+
+    # Act
+    best = choose_threshold(sweep_thresholds(y_true, churn_proba))
+
+    # Assert
+    assert 0.3 < best <= 0.6
+
+
+def test_summarize_folds_confidence_interval():
+    """
+    Test 3: The CV summary must contain mean, std and a confidence interval around the mean.
+    """
+
+    # Arrange
+    fold_scores = [{"f1": 0.70}, {"f1": 0.75}, {"f1": 0.80}]
+
+    # Act
+    summary = summarize_folds(fold_scores, confidence=0.95)
+
+    # Assert
+    assert summary["f1_mean"] == pytest.approx(0.75)
+    assert summary["f1_std"] == pytest.approx(0.05)
+    # t(0.975, df=2) = 4.303 -> half width = 4.303 * 0.05 / sqrt(3)
+    assert summary["f1_ci_high"] - summary["f1_mean"] == pytest.approx(0.1242, abs=1e-3)
+    assert summary["f1_ci_low"] == pytest.approx(2 * 0.75 - summary["f1_ci_high"])
+
+
+def test_cross_validate_parallel_matches_serial(synthetic_holdout):
+    """
+    Test 4 (CV): Parallel folds over the shared memmap must give the same scores as the serial run.
+    """
+
+    # Arrange
+    X, y = synthetic_holdout
+
+    # Act
+    parallel = cross_validate_parallel(X, y, n_splits=3, n_jobs=2)
+    serial = cross_validate_parallel(X, y, n_splits=3, n_jobs=1)
+
+    # Assert
+    assert len(parallel["folds"]) == 3
+    for metric in ["f1", "logloss", "auc"]:
+        assert parallel["summary"][f"{metric}_mean"] == pytest.approx(serial["summary"][f"{metric}_mean"])
+    assert parallel["summary"]["f1_ci_low"] <= parallel["summary"]["f1_mean"] <= parallel["summary"]["f1_ci_high"]
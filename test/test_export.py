@@ -0,0 +1,84 @@
+# test/test_export.py
+
+import numpy as np
+
+from src.config import EXPORT_FIDELITY_TOLERANCE, PRUNE_PATIENCE, XGB_PARAMS, INPUT_COLUMNS
+from src.export import (
+    CategoryIndex,
+    NativeChurnPredictor,
+    export_inference_artifact,
+    find_pruned_tree_count,
+    pruned_churn_proba,
+    compare_with_pipeline
+)
+from src.pipeline import create_pipeline, fit_with_eval_set
+from benchmarks.synthetic import make_customer_features
+
+
+def test_exported_artifact_matches_pipeline(synthetic_pipeline, synthetic_holdout, tmp_path):
+    """
+    Test 1 (Fidelity): The native booster + folded preprocessing must reproduce the joblib pipeline's probabilities.
+    """
+
+    # Arrange
+    X, _ = synthetic_holdout
+    X = X.copy()
+    X.loc[X.index[0], "Country"] = "Atlantis"  # unknown category -> ignored like OneHotEncoder does
+
+    # Act
+    export_inference_artifact(synthetic_pipeline, tmp_path)
+    predictor = NativeChurnPredictor.load(tmp_path)
+
+    # Assert
+    expected = synthetic_pipeline.predict_proba(X)[:, 1]
+    np.testing.assert_allclose(predictor.predict_proba(X), expected, atol=EXPORT_FIDELITY_TOLERANCE)
+
+
+def test_pruned_export_keeps_fewer_trees(tmp_path):
+    """
+    Test 2 (Pruning): On labels the model cannot learn, the validation logloss stops improving early,
+    so pruning must drop trees. The pruned artifact matches the pipeline restricted to the same trees
+    and stores its own decision threshold.
+    """
+
+    # Arrange
+    rng = np.random.default_rng(0)
+    features_df = make_customer_features(600, seed=0)
+    holdout_df = make_customer_features(400, seed=100)
+    X, X_val = features_df[INPUT_COLUMNS], holdout_df[INPUT_COLUMNS]
+    y, y_val = rng.integers(0, 2, len(X)), rng.integers(0, 2, len(X_val))  # pure noise: extra trees only overfit
+    pipeline = fit_with_eval_set(create_pipeline(), X, y, X_val, y_val)
+
+    # Act
+    n_trees, curve = find_pruned_tree_count(pipeline)
+    export_inference_artifact(pipeline, tmp_path, n_trees=n_trees, threshold=0.42)
+    predictor = NativeChurnPredictor.load(tmp_path)
+    report = compare_with_pipeline(pipeline, predictor, X_val, repeats=3)
+
+    # Assert
+    assert n_trees < XGB_PARAMS["n_estimators"]
+    assert len(curve) == n_trees + PRUNE_PATIENCE  # stopped early, not after all rounds
+    assert curve == pipeline.named_steps["classifier"].evals_result()["validation_0"]["logloss"][:len(curve)]
+    assert report["n_trees"] == n_trees
+    assert report["max_abs_proba_diff"] <= EXPORT_FIDELITY_TOLERANCE
+    np.testing.assert_allclose(predictor.predict_proba(X_val), pruned_churn_proba(pipeline, X_val, n_trees),
+                               atol=EXPORT_FIDELITY_TOLERANCE)
+    assert predictor.threshold == 0.42
+
+
+def test_category_index_normalizes_and_counts_unknowns():
+    """
+    Test 3 (Serving Index): Case/whitespace variants map to the fitted category,
+    missing values get the training mode and unknown values are counted.
+    """
+
+    # Arrange
+    index = CategoryIndex(["France", "Germany", "United Kingdom"], fill_value="United Kingdom")
+
+    # Act
+    positions = index.lookup(["France", "  united   KINGDOM ", None, "Atlantis", "germany", "Atlantis"])
+
+    # Assert
+    assert positions.tolist() == [0, 2, 2, -1, 1, -1]
+    assert index.position("FRANCE") == 0
+    assert index.stats() == {"vocabulary_size": 3, "lookups": 6, "unknown": 2, "unknown_rate": 2 / 6}
@@ -0,0 +1,45 @@
+# test/test_load_test.py
+
+import asyncio
+import pytest
+
+from benchmarks.load_test import run_load_test, summarize
+from benchmarks.synthetic import save_synthetic_model
+
+
+def test_summarize_reports_percentiles_and_error_rate():
+    """
+    Test 1: Are RPS, latency percentiles and the error rate computed correctly?
+    """
+
+    # Arrange: 4 requests of 10, 20, 30, 40 ms in 2 seconds, 1 of them failed
+    latencies = [0.010, 0.020, 0.030, 0.040]
+
+    # Act
+    stats = summarize(latencies, n_errors=1, wall_time=2.0)
+
+    # Assert
+    assert stats["requests"] == 4
+    assert stats["rps"] == pytest.approx(2.0)
+    assert stats["error_rate"] == pytest.approx(0.25)
+    assert stats["p50_ms"] == pytest.approx(25.0)
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= 40.0
+
+
+def test_load_test_in_process_asgi(tmp_path):
+    """
+    Test 2 (CI Load Test): The in-process (ASGI) mode needs no Docker, network or raw data.
+    A synthetic model is served and every '/predict' request must succeed.
+    """
+
+    # Arrange
+    model_path = save_synthetic_model(tmp_path / "churn_model.joblib", n_customers=500)
+
+    # Act
+    report = asyncio.run(run_load_test(model_path, mode="asgi", n_requests=40, concurrency=4, warmup=2))
+
+    # Assert
+    stats = report["predict"]
+    assert stats["requests"] == 40
+    assert stats["error_rate"] == 0.0
+    assert stats["rps"] > 0
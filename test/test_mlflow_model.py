@@ -0,0 +1,29 @@
+# test/test_mlflow_model.py
+
+import mlflow.pyfunc
+import numpy as np
+
+from src.config import DECISION_THRESHOLD
+from src.mlflow_model import save_pyfunc_model
+
+
+def test_pyfunc_model_wraps_the_joblib_file(synthetic_pipeline, synthetic_model_path, synthetic_holdout, tmp_path):
+    """
+    Test 1: The MLflow model directory must load with 'mlflow.pyfunc.load_model' and return the same
+    decisions/probabilities as the joblib pipeline; the data file is the dumped joblib file itself.
+    """
+
+    # Arrange
+    X, _ = synthetic_holdout
+
+    # Act
+    model_dir = save_pyfunc_model(synthetic_pipeline, synthetic_model_path, tmp_path / "mlflow_model", X.head())
+    predictions = mlflow.pyfunc.load_model(str(model_dir)).predict(X)
+
+    # Assert
+    assert (model_dir / "MLmodel").exists()
+    assert (model_dir / "data" / synthetic_model_path.name).read_bytes() == synthetic_model_path.read_bytes()
+    expected_proba = synthetic_pipeline.predict_proba(X)[:, 1]
+    np.testing.assert_allclose(predictions["CHURN_PROBABILITY"], expected_proba, rtol=1e-6)
+    threshold = getattr(synthetic_pipeline, "decision_threshold_", DECISION_THRESHOLD)
+    assert (predictions["CHURN"] == (expected_proba >= threshold)).all()
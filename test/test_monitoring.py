@@ -0,0 +1,103 @@
+# test/test_monitoring.py
+
+import numpy as np
+import pytest
+
+from src.config import INPUT_COLUMNS
+from src.monitoring import DriftMonitor, build_reference_profile
+from benchmarks.synthetic import make_payloads
+
+
+def _columns(features_df) -> dict:
+    return {column: features_df[column].to_numpy() for column in INPUT_COLUMNS}
+
+
+def test_drift_monitor_is_stable_on_training_like_traffic(synthetic_pipeline, synthetic_holdout):
+    """
+    Test 1: Unseen customers from the training distribution must score low PSI on every feature,
+    and the monitor's state must not grow with the number of observed rows.
+    """
+
+    # Arrange
+    X, _ = synthetic_holdout
+    monitor = DriftMonitor(synthetic_pipeline.reference_profile_, min_samples=100)
+    predictions = (synthetic_pipeline.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+    # Act
+    monitor.update(_columns(X), predictions)
+    sizes_before = [counts.size for counts in monitor._numeric_counts.values()]
+    monitor.update(_columns(X), predictions)
+    report = monitor.report()
+
+    # Assert
+    assert report["n_observed"] == 2 * len(X)
+    assert report["status"] in ("stable", "warning")
+    assert all(scores["psi"] < 0.25 for scores in report["features"].values())
+    assert [counts.size for counts in monitor._numeric_counts.values()] == sizes_before
+
+
+def test_drift_monitor_flags_shifted_inputs(synthetic_pipeline, synthetic_holdout):
+    """
+    Test 2: Much higher spend and a new country mix must raise PSI/KS alerts for Monetary and Country.
+    """
+
+    # Arrange
+    X, _ = synthetic_holdout
+    shifted = _columns(X)
+    shifted["Monetary"] = shifted["Monetary"] * 20
+    shifted["Country"] = np.where(np.arange(len(X)) % 2 == 0, "Japan", "Germany")
+    monitor = DriftMonitor(synthetic_pipeline.reference_profile_, min_samples=100)
+
+    # Act
+    monitor.update(shifted, np.ones(len(X), dtype=int))
+    report = monitor.report(refresh=True)
+
+    # Assert
+    assert report["status"] == "alert"
+    assert report["features"]["Monetary"]["status"] == "alert"
+    assert report["features"]["Monetary"]["ks"] > 0.5
+    assert report["features"]["Country"]["status"] == "alert"
+    assert report["prediction"]["live_churn_rate"] == 1.0
+
+
+def test_drift_endpoint_counts_predict_and_columnar_traffic(api_client):
+    """
+    Test 3 (API): Rows scored by '/predict' and '/predict/columnar' are counted in '/monitoring/drift'.
+    """
+
+    # Arrange
+    payloads = make_payloads(150, seed=9)
+    columnar_body = {column: [payload[column] for payload in payloads[1:]]
+                     for column in INPUT_COLUMNS}
+    before = api_client.get("/monitoring/drift", params={"refresh": True}).json()["n_observed"]
+
+    # Act
+    api_client.post("/predict", json=payloads[0])
+    api_client.post("/predict/columnar", json=columnar_body)
+    report = api_client.get("/monitoring/drift", params={"refresh": True}).json()
+
+    # Assert
+    assert report["n_observed"] == before + len(payloads)
+    assert set(report["features"]) == set(INPUT_COLUMNS)
+    assert {"psi", "ks"} <= set(report["features"]["Monetary"])
+    assert 0.0 <= report["prediction"]["live_churn_rate"] <= 1.0
+
+
+def test_reference_profile_describes_one_population(synthetic_pipeline, synthetic_holdout):
+    """
+    Test 4: Bins, n_samples and the reference churn rate come from the same rows;
+    probabilities of other rows are refused.
+    """
+
+    # Arrange
+    X, _ = synthetic_holdout
+    churn_proba = synthetic_pipeline.predict_proba(X)[:, 1]
+
+    # Act
+    profile = build_reference_profile(X, churn_proba, threshold=0.5)
+
+    # Assert
+    assert profile["n_samples"] == len(X)
+    assert profile["prediction"]["churn_rate"] == pytest.approx(np.mean(churn_proba >= 0.5))
+    with pytest.raises(ValueError):
+        build_reference_profile(X, churn_proba[:100], threshold=0.5)
@@ -4,7 +4,7 @@ import pytest
 from sklearn.pipeline import Pipeline
 from xgboost import XGBClassifier
 
-from src.pipeline import create_pipeline
+from src.pipeline import create_pipeline, fit_with_eval_set
 
 
 def test_create_pipeline_returns_pipeline_object():
@@ -43,4 +43,25 @@ def test_create_pipeline_uses_xgboost_by_default():
 
     # Assert
     classifier_step = pipeline.named_steps['classifier']
-    assert isinstance(classifier_step, XGBClassifier)
\ No newline at end of file
+    assert isinstance(classifier_step, XGBClassifier)
+
+
+def test_fit_with_eval_set_stops_early(synthetic_holdout):
+    """
+    Test 4 (Early Stopping): With an eval set, XGBoost tracks the validation logloss
+    and records the best iteration instead of blindly training all 'n_estimators'.
+    """
+
+    # Arrange
+    X, y = synthetic_holdout
+    X_train, X_val, y_train, y_val = X.iloc[:300], X.iloc[300:], y.iloc[:300], y.iloc[300:]
+    pipeline = create_pipeline(early_stopping_rounds=5)
+
+    # Act
+    fit_with_eval_set(pipeline, X_train, y_train, X_val, y_val)
+
+    # Assert
+    classifier = pipeline.named_steps['classifier']
+    val_curve = classifier.evals_result()['validation_0']['logloss']
+    assert len(val_curve) == classifier.best_iteration + 1 + 5
+    assert min(val_curve) == pytest.approx(classifier.best_score)
@@ -0,0 +1,98 @@
+# test/test_sketches.py
+
+import numpy as np
+import pandas as pd
+
+from src.config import COL_CUSTOMER_ID, COL_INVOICE
+from src.sketches import InvoiceSketch, sketch_invoices
+import src.feature_engineering as feature_engineering
+from src.feature_engineering import calculate_rfm
+from benchmarks.synthetic import make_transactions
+
+
+def test_chunked_sketches_merge_to_the_single_pass_sketch(tmp_path):
+    """
+    Test 1: Sketches built per chunk (and saved/loaded in between, like one file per day)
+    must merge into exactly the registers of one pass over all rows.
+    """
+
+    # Arrange
+    df = make_transactions(500, seed=3)
+
+    # Act
+    single_pass = sketch_invoices(df, COL_CUSTOMER_ID, COL_INVOICE)
+    chunked = sketch_invoices(df, COL_CUSTOMER_ID, COL_INVOICE, chunk_size=20_000)
+    first, second = df.iloc[:len(df) // 2], df.iloc[len(df) // 2:]
+    InvoiceSketch.from_transactions(first[COL_CUSTOMER_ID], first[COL_INVOICE]).save(tmp_path / "day1.npz")
+    merged = InvoiceSketch.load(tmp_path / "day1.npz").merge(
+        InvoiceSketch.from_transactions(second[COL_CUSTOMER_ID], second[COL_INVOICE]))
+
+    # Assert
+    for sketch in (chunked, merged):
+        assert np.array_equal(sketch.customer_ids, single_pass.customer_ids)
+        assert np.array_equal(sketch.registers, single_pass.registers)
+
+
+def test_sketch_estimates_are_close_to_exact_counts():
+    """
+    Test 2: Estimates must be almost exact for small counts and within a few percent overall;
+    the same invoice read as int or str must count once.
+    """
+
+    # Arrange
+    df = make_transactions(2000, seed=5)
+    exact = df.groupby(COL_CUSTOMER_ID)[COL_INVOICE].nunique()
+    mixed_types = pd.DataFrame({COL_CUSTOMER_ID: [1.0, 1.0, 1.0], COL_INVOICE: [489434, "489434", "C489449"]})
+
+    # Act
+    estimate = sketch_invoices(df, COL_CUSTOMER_ID, COL_INVOICE).estimate().reindex(exact.index)
+    mixed_estimate = sketch_invoices(mixed_types, COL_CUSTOMER_ID, COL_INVOICE).estimate()
+
+    # Assert
+    relative_error = np.abs(estimate - exact) / exact
+    assert relative_error.mean() < 0.03
+    assert (estimate[exact == 1].round() == 1).all()
+    assert round(mixed_estimate.loc[1.0]) == 2
+
+
+def test_calculate_rfm_hll_mode_matches_exact_layout():
+    """
+    Test 3: The 'hll' Frequency mode must produce the same RFM table (columns, customers,
+    Recency/Monetary/Country) as the exact mode, with integer Frequency >= 1.
+    """
+
+    # Arrange
+    df = make_transactions(300, seed=11)
+    analysis_date = pd.Timestamp("2011-12-10")
+
+    # Act
+    exact = calculate_rfm(df, analysis_date, "exact")
+    approximate = calculate_rfm(df, analysis_date, "hll", chunk_size=10_000)
+
+    # Assert
+    assert list(approximate.columns) == list(exact.columns)
+    pd.testing.assert_frame_equal(approximate.drop(columns="Frequency"), exact.drop(columns="Frequency"))
+    assert approximate["Frequency"].dtype.kind == "i"
+    assert (approximate["Frequency"] >= 1).all()
+
+
+def test_create_customer_features_passes_chunking_through(monkeypatch):
+    """
+    Test 4: The feature run itself sketches chunk by chunk on several workers, and the result
+    equals the single-pass features.
+    """
+
+    # Arrange
+    df = make_transactions(300, seed=13)
+    monkeypatch.setattr(feature_engineering, "load_and_clean_data", lambda: df.copy())
+    calls = []
+    monkeypatch.setattr(feature_engineering, "sketch_invoices",
+                        lambda *args: calls.append(args[-2:]) or sketch_invoices(*args))
+
+    # Act
+    chunked = feature_engineering.create_customer_features("hll", chunk_size=5_000, n_jobs=2)
+    single_pass = feature_engineering.create_customer_features("hll", chunk_size=0)
+
+    # Assert
+    assert calls == [(5_000, 2), (0, 1)]
+    pd.testing.assert_frame_equal(chunked, single_pass)
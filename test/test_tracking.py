@@ -0,0 +1,76 @@
+# test/test_tracking.py
+
+import threading
+
+import pytest
+from mlflow.tracking import MlflowClient
+
+from src.tracking import AsyncMlflowLogger
+
+
+@pytest.fixture
+def mlflow_run(tmp_path, monkeypatch):
+    """
+    pytest Fixture: A run in a temporary local MLflow file store (no global tracking URI is changed).
+    """
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    client = MlflowClient(tracking_uri=(tmp_path / "mlruns").as_uri())
+    experiment_id = client.create_experiment("test", artifact_location=(tmp_path / "artifacts").as_uri())
+    run = client.create_run(experiment_id)
+    return client, run.info.run_id
+
+
+def test_async_logger_flushes_everything_on_close(mlflow_run, tmp_path):
+    """
+    Test 1: Params, metric curves and artifacts logged through the background logger
+    must all be in the run once the logger is closed.
+    """
+
+    # Arrange
+    client, run_id = mlflow_run
+    model_file = tmp_path / "churn_model.joblib"
+    model_file.write_bytes(b"already-serialized-model")
+
+    # Act
+    with AsyncMlflowLogger(run_id, client=client, max_batch_size=10) as tracker:
+        tracker.log_params({"test_size": 0.2, "random_state": 42})
+        tracker.log_param("random_state", 42)  # duplicate key (also in XGB_PARAMS) must not break the batch
+        for step in range(25):
+            tracker.log_metric("val_logloss", 1.0 / (step + 1), step=step)
+        tracker.log_artifact(model_file, artifact_path="model_churn")
+
+    # Assert
+    run = client.get_run(run_id)
+    assert run.data.params == {"test_size": "0.2", "random_state": "42"}
+    assert len(client.get_metric_history(run_id, "val_logloss")) == 25
+    assert [a.path for a in client.list_artifacts(run_id, "model_churn")] == ["model_churn/churn_model.joblib"]
+    assert tracker.errors == []
+
+
+def test_async_logger_builds_artifacts_in_the_background(mlflow_run, tmp_path):
+    """
+    Test 2: 'log_built_artifacts' builds the directory on the logger's thread (not the caller's)
+    and uploads it; 'flush()' after 'close()' returns instead of blocking.
+    """
+
+    # Arrange
+    client, run_id = mlflow_run
+    build_threads = []
+
+    def build():
+        build_threads.append(threading.current_thread().name)
+        model_dir = tmp_path / "mlflow_model"
+        model_dir.mkdir()
+        (model_dir / "MLmodel").write_text("flavors: {}")
+        return model_dir
+
+    # Act
+    tracker = AsyncMlflowLogger(run_id, client=client)
+    tracker.log_built_artifacts(build, artifact_path="model_churn")
+    tracker.close()
+    tracker.flush()
+
+    # Assert
+    assert build_threads == ["mlflow-logger"]
+    assert [a.path for a in client.list_artifacts(run_id, "model_churn")] == ["model_churn/MLmodel"]
+    assert tracker.errors == []